@@ -8,6 +8,7 @@ from snips_nlu.cli import (
     cross_val_metrics, download, download_all_languages, generate_dataset,
     link, train_test_metrics)
 from snips_nlu.cli.inference import parse
+from snips_nlu.cli.serve import serve
 from snips_nlu.cli.training import train
 from snips_nlu.cli.utils import PrettyPrintLevel, pretty_print
 
@@ -16,6 +17,7 @@ def main():
     commands = {
         "train": train,
         "parse": parse,
+        "serve": serve,
         "download": download,
         "download-all-languages": download_all_languages,
         "link": link,
@@ -1,6 +1,7 @@
 from __future__ import unicode_literals
 
 from builtins import object, str
+from threading import Lock
 
 from snips_nlu_ontology import (
     BuiltinEntityParser as _BuiltinEntityParser, get_all_builtin_entities,
@@ -15,29 +16,37 @@ class BuiltinEntityParser(object):
         self.parser = _BuiltinEntityParser(language)
         self.supported_entities = get_supported_entities(language)
         self._cache = LimitedSizeDict(size_limit=1000)
+        self._cache_lock = Lock()
 
     def parse(self, text, scope=None, use_cache=True):
         text = text.lower()  # Rustling only works with lowercase
         if not use_cache:
             return self.parser.parse(text, scope)
         cache_key = (text, str(scope))
-        if cache_key not in self._cache:
+        # The lock only guards the cache accesses so that the native parsing
+        # of different texts can run concurrently
+        with self._cache_lock:
+            parser_result = self._cache.get(cache_key)
+        if parser_result is None:
             parser_result = self.parser.parse(text, scope)
-            self._cache[cache_key] = parser_result
-        return self._cache[cache_key]
+            with self._cache_lock:
+                self._cache[cache_key] = parser_result
+        return parser_result
 
     def supports_entity(self, entity):
         return entity in self.supported_entities
 
 
 _RUSTLING_PARSERS = dict()
+_RUSTLING_PARSERS_LOCK = Lock()
 
 
 def get_builtin_entity_parser(language):
     global _RUSTLING_PARSERS
-    if language not in _RUSTLING_PARSERS:
-        _RUSTLING_PARSERS[language] = BuiltinEntityParser(language)
-    return _RUSTLING_PARSERS[language]
+    with _RUSTLING_PARSERS_LOCK:
+        if language not in _RUSTLING_PARSERS:
+            _RUSTLING_PARSERS[language] = BuiltinEntityParser(language)
+        return _RUSTLING_PARSERS[language]
 
 
 def get_builtin_entities(text, language, scope=None, use_cache=True):
@@ -0,0 +1,81 @@
+from __future__ import print_function, unicode_literals
+
+import json
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import plac
+
+from snips_nlu.nlu_engine import EngineWorkerPool
+
+
+@plac.annotations(
+    training_path=("Path to a trained engine", "positional", None, str),
+    host=("Host on which the server listens", "option", "H", str),
+    port=("Port on which the server listens", "option", "p", int),
+    n_workers=("Number of parsing worker processes, defaults to the number of "
+               "CPUs", "option", "w", int))
+def serve(training_path, host="localhost", port=8080, n_workers=None):
+    """Serve a trained NLU engine over HTTP using a pool of worker processes
+
+    The engine is loaded once and shared copy-on-write by the workers. Queries
+    are parsed by sending a POST request on "/parse" with a json body
+    containing an "input" and optionally a list of "intents". A list of
+    queries can be parsed at once by posting their "inputs" on
+    "/parse_batch".
+    """
+    with EngineWorkerPool(training_path, n_workers) as pool:
+        server = make_server(pool, host, port)
+        print("Serving NLU engine on http://%s:%s" % (host, port))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def make_server(pool, host, port):
+    """Create a HTTP server which dispatches parsing requests to the
+    provided :class:`.EngineWorkerPool`"""
+
+    class ParsingRequestHandler(BaseHTTPRequestHandler):
+        def do_POST(self):  # pylint:disable=invalid-name
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length).decode("utf8"))
+                intents = body.get("intents")
+                if self.path == "/parse":
+                    result = pool.parse(body["input"], intents)
+                elif self.path == "/parse_batch":
+                    result = pool.parse_batch(body["inputs"], intents)
+                else:
+                    self._send_json(404, {"error": "Unknown path: %s"
+                                                   % self.path})
+                    return
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            except Exception as e:  # pylint: disable=W0703
+                # e.g. a broken worker pool, the client must still get a
+                # response
+                self._send_json(500, {"error": str(e)})
+                return
+            self._send_json(200, result)
+
+        def _send_json(self, status, data):
+            response = json.dumps(data).encode("utf8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(response)))
+            self.end_headers()
+            self.wfile.write(response)
+
+        def log_message(self, format, *args):
+            pass
+
+    return _ThreadingHTTPServer((host, port), ParsingRequestHandler)
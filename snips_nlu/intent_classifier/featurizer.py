@@ -1,13 +1,17 @@
 from __future__ import division, unicode_literals
 
-from builtins import object, range
+import json
+import math
+from builtins import object, range, str, zip
 from collections import defaultdict
+from pathlib import Path
 
 import numpy as np
 import scipy.sparse as sp
 from future.utils import iteritems
 from sklearn.feature_extraction.text import TfidfTransformer, TfidfVectorizer
 from sklearn.feature_selection import chi2
+from sklearn.utils.validation import check_is_fitted
 from snips_nlu_utils import normalize
 
 from snips_nlu.builtin_entities import get_builtin_entities, is_builtin_entity
@@ -20,6 +24,11 @@ from snips_nlu.preprocessing import stem, tokenize_light
 from snips_nlu.resources import (
     MissingResource, get_stop_words, get_word_cluster)
 from snips_nlu.slot_filler.features_utils import get_all_ngrams
+from snips_nlu.utils import json_string
+
+FEATURIZER_FILENAME = "featurizer.json"
+VOCABULARY_FILENAME = "vocabulary.npy"
+IDF_DIAG_FILENAME = "idf_diag.npy"
 
 
 class Featurizer(object):
@@ -38,8 +47,10 @@ class Featurizer(object):
 
         self.unknown_words_replacement_string = \
             unknown_words_replacement_string
+        self._inference_vectorizer = None
 
     def fit(self, dataset, utterances, classes):
+        self._inference_vectorizer = None
         utterances_texts = (get_text_from_chunks(u[DATA]) for u in utterances)
         if not any(tokenize_light(q, self.language) for q in utterances_texts):
             return None
@@ -63,51 +74,71 @@ class Featurizer(object):
         X_train_tfidf = self.tfidf_vectorizer.fit_transform(
             preprocessed_utterances)
         # pylint: enable=C0103
-        features_idx = {self.tfidf_vectorizer.vocabulary_[word]: word for word
-                        in self.tfidf_vectorizer.vocabulary_}
-
-        stop_words = get_stop_words(self.language)
-
         _, pval = chi2(X_train_tfidf, classes)
-        self.best_features = [i for i, v in enumerate(pval) if
-                              v < self.config.pvalue_threshold]
-        if not self.best_features:
-            self.best_features = [idx for idx, val in enumerate(pval) if
-                                  val == pval.min()]
-
-        feature_names = {}
-        for utterance_index in self.best_features:
-            feature_names[utterance_index] = {
-                "word": features_idx[utterance_index],
-                "pval": pval[utterance_index]}
-
-        for feat in feature_names:
-            if feature_names[feat]["word"] in stop_words:
-                if feature_names[feat]["pval"] > \
-                        self.config.pvalue_threshold / 2.0:
-                    self.best_features.remove(feat)
-
+        is_selected = pval < self.config.pvalue_threshold
+        if not is_selected.any():
+            is_selected = pval == pval.min()
+
+        # Stop words are only kept when they are strongly correlated with the
+        # classes
+        vocabulary = self.tfidf_vectorizer.vocabulary_
+        is_stop_word = np.zeros(pval.shape, dtype=bool)
+        is_stop_word[[vocabulary[word] for word
+                      in get_stop_words(self.language)
+                      if word in vocabulary]] = True
+        is_selected &= ~(is_stop_word
+                         & (pval > self.config.pvalue_threshold / 2.0))
+        self.best_features = np.flatnonzero(is_selected).tolist()
         return self
 
-    def transform(self, utterances):
-        preprocessed_utterances = self.preprocess_utterances(utterances)
-        # pylint: disable=C0103
-        X_train_tfidf = self.tfidf_vectorizer.transform(
-            preprocessed_utterances)
-        X = X_train_tfidf[:, self.best_features]
-        # pylint: enable=C0103
-        return X
+    def transform(self, utterances, contexts=None):
+        preprocessed_utterances = self.preprocess_utterances(utterances,
+                                                             contexts)
+        if self._inference_vectorizer is None:
+            check_is_fitted(self.tfidf_vectorizer, "vocabulary_")
+            self._inference_vectorizer = _InferenceTfidfVectorizer(
+                self.tfidf_vectorizer.vocabulary_,
+                self.tfidf_vectorizer.idf_, self.best_features,
+                self.language, self.config.sublinear_tf)
+        return self._inference_vectorizer.transform(preprocessed_utterances)
 
     def fit_transform(self, dataset, queries, y):
         return self.fit(dataset, queries, y).transform(queries)
 
-    def preprocess_utterances(self, utterances):
-        return [
-            _preprocess_utterance(
-                u, self.language, self.entity_utterances_to_feature_names,
-                self.config.word_clusters_name)
-            for u in utterances
-        ]
+    def preprocess_utterances(self, utterances, contexts=None):
+        if contexts is None:
+            contexts = [None for _ in utterances]
+        texts = [get_text_from_chunks(u[DATA]) for u in utterances]
+
+        # The builtin entities are parsed once per distinct text, and the
+        # strings are normalized and stemmed once per distinct value, so that
+        # the cost of the preprocessing does not grow with the redundancy of
+        # the utterances
+        builtin_entities_per_text = dict()
+        for text, context in zip(texts, contexts):
+            if context is None and text not in builtin_entities_per_text:
+                builtin_entities_per_text[text] = get_builtin_entities(
+                    text, self.language, use_cache=True)
+        normalized_stems = dict()
+
+        preprocessed_utterances = []
+        for utterance, text, context in zip(utterances, texts, contexts):
+            if context is not None:
+                tokens = context.tokens_values
+                normalized_stemmed_tokens = context.normalized_stemmed_tokens
+                builtin_entities = context.get_builtin_entities(
+                    use_cache=True)
+            else:
+                tokens = tokenize_light(text, self.language)
+                normalized_stemmed_tokens = [
+                    _get_normalized_stem(t, self.language, normalized_stems)
+                    for t in tokens]
+                builtin_entities = builtin_entities_per_text[text]
+            preprocessed_utterances.append(_preprocess_utterance(
+                utterance, self.language, tokens, normalized_stemmed_tokens,
+                builtin_entities, self.entity_utterances_to_feature_names,
+                self.config.word_clusters_name, normalized_stems))
+        return preprocessed_utterances
 
     def to_dict(self):
         """Returns a json-serializable dict"""
@@ -142,6 +173,61 @@ class Featurizer(object):
                 self.unknown_words_replacement_string
         }
 
+    def persist(self, path):
+        """Persists the featurizer in a directory
+
+        The vocabulary and the idf weights of the tf-idf vectorizer are saved
+        in binary NumPy files, the rest of the featurizer being saved in a
+        json file.
+        """
+        path = Path(path)
+        path.mkdir()
+        featurizer_dict = self.to_dict()
+        vocab = featurizer_dict["tfidf_vectorizer"]["vocab"]
+        idf_diag = featurizer_dict["tfidf_vectorizer"]["idf_diag"]
+        vectorizer_files = None
+        if vocab is not None:
+            # The words are saved in the order of their feature index
+            words = sorted(vocab, key=lambda word: vocab[word])
+            with (path / VOCABULARY_FILENAME).open(mode="wb") as f:
+                np.save(f, np.array(words))
+            with (path / IDF_DIAG_FILENAME).open(mode="wb") as f:
+                np.save(f, np.array(idf_diag))
+            vectorizer_files = {
+                "vocab_file": VOCABULARY_FILENAME,
+                "idf_diag_file": IDF_DIAG_FILENAME
+            }
+        featurizer_dict["tfidf_vectorizer"] = vectorizer_files
+        featurizer_json = json_string(featurizer_dict)
+        with (path / FEATURIZER_FILENAME).open(mode="w") as f:
+            f.write(featurizer_json)
+
+    @classmethod
+    def from_path(cls, path):
+        """Loads a :class:`Featurizer` instance from a directory
+
+        The data at the given path must have been generated using
+        :func:`~Featurizer.persist`
+        """
+        path = Path(path)
+        with (path / FEATURIZER_FILENAME).open(encoding="utf8") as f:
+            featurizer_dict = json.load(f)
+        vectorizer_files = featurizer_dict["tfidf_vectorizer"]
+        vocab = None
+        idf_diag = None
+        if vectorizer_files is not None:
+            with (path / vectorizer_files["vocab_file"]).open(mode="rb") as f:
+                words = np.load(f, allow_pickle=False)
+            vocab = {str(word): i for i, word in enumerate(words)}
+            with (path / vectorizer_files["idf_diag_file"]).open(
+                    mode="rb") as f:
+                idf_diag = np.load(f, allow_pickle=False)
+        featurizer_dict["tfidf_vectorizer"] = {
+            "vocab": vocab,
+            "idf_diag": idf_diag
+        }
+        return cls.from_dict(featurizer_dict)
+
     @classmethod
     def from_dict(cls, obj_dict):
         """Creates a :class:`Featurizer` instance from a :obj:`dict`
@@ -169,6 +255,53 @@ class Featurizer(object):
         return self
 
 
+class _InferenceTfidfVectorizer(object):
+    """Inference-only equivalent of a fitted :class:`TfidfVectorizer` whose
+    output is restricted to a subset of selected features
+
+    The tf-idf vectors are built directly from a dict mapping each word of the
+    vocabulary to its idf weight and to its column in the selected features,
+    which avoids the overhead of the sklearn vectorizer on small inputs. As
+    with the sklearn vectorizer, the vectors are l2-normalized over the whole
+    vocabulary before the features are selected.
+    """
+
+    def __init__(self, vocabulary, idf, selected_features, language,
+                 sublinear_tf):
+        columns = {feature_index: column for column, feature_index
+                   in enumerate(selected_features)}
+        self.vocabulary = {
+            word: (float(idf[feature_index]),
+                   columns.get(int(feature_index)))
+            for word, feature_index in iteritems(vocabulary)}
+        self.n_features = len(selected_features)
+        self.language = language
+        self.sublinear_tf = sublinear_tf
+
+    def transform(self, documents):
+        data = []
+        indices = []
+        indptr = [0]
+        for document in documents:
+            counts = defaultdict(int)
+            for word in tokenize_light(document.lower(), self.language):
+                if word in self.vocabulary:
+                    counts[word] += 1
+            weights = []
+            for word, count in iteritems(counts):
+                tf = math.log(count) + 1 if self.sublinear_tf else count
+                idf, column = self.vocabulary[word]
+                weights.append((tf * idf, column))
+            norm = math.sqrt(sum(weight ** 2 for weight, _ in weights))
+            for weight, column in weights:
+                if column is not None:
+                    indices.append(column)
+                    data.append(weight / norm)
+            indptr.append(len(indices))
+        return sp.csr_matrix((data, indices, indptr),
+                             shape=(len(documents), self.n_features))
+
+
 def _get_tfidf_vectorizer(language, sublinear_tf=False):
     return TfidfVectorizer(tokenizer=lambda x: tokenize_light(x, language),
                            sublinear_tf=sublinear_tf)
@@ -198,14 +331,22 @@ def _normalize_stem(text, language):
     return normalized_stemmed
 
 
+def _get_normalized_stem(text, language, normalized_stems):
+    normalized_stem = normalized_stems.get(text)
+    if normalized_stem is None:
+        normalized_stem = _normalize_stem(text, language)
+        normalized_stems[text] = normalized_stem
+    return normalized_stem
+
+
 def _get_word_cluster_features(query_tokens, clusters_name, language):
     if not clusters_name:
         return []
     ngrams = get_all_ngrams(query_tokens)
+    word_clusters = get_word_cluster(language, clusters_name)
     cluster_features = []
     for ngram in ngrams:
-        cluster = get_word_cluster(language, clusters_name).get(
-            ngram[NGRAM].lower(), None)
+        cluster = word_clusters.get(ngram[NGRAM].lower(), None)
         if cluster is not None:
             cluster_features.append(cluster)
     return cluster_features
@@ -221,20 +362,15 @@ def _get_dataset_entities_features(normalized_stemmed_tokens,
     return entity_features
 
 
-def _preprocess_utterance(utterance, language,
+def _preprocess_utterance(utterance, language, utterance_tokens,
+                          normalized_stemmed_tokens, builtin_entities,
                           entity_utterances_to_features_names,
-                          word_clusters_name):
-    utterance_text = get_text_from_chunks(utterance[DATA])
-    utterance_tokens = tokenize_light(utterance_text, language)
+                          word_clusters_name, normalized_stems):
     word_clusters_features = _get_word_cluster_features(
         utterance_tokens, word_clusters_name, language)
-    normalized_stemmed_tokens = [_normalize_stem(t, language)
-                                 for t in utterance_tokens]
     entities_features = _get_dataset_entities_features(
         normalized_stemmed_tokens, entity_utterances_to_features_names)
 
-    builtin_entities = get_builtin_entities(utterance_text, language,
-                                            use_cache=True)
     builtin_entities_features = [
         _builtin_entity_to_feature(ent[ENTITY_KIND], language)
         for ent in builtin_entities
@@ -243,7 +379,8 @@ def _preprocess_utterance(utterance, language,
     # We remove values of builtin slots from the utterance to avoid learning
     # specific samples such as '42' or 'tomorrow'
     filtered_normalized_stemmed_tokens = [
-        _normalize_stem(chunk[TEXT], language) for chunk in utterance[DATA]
+        _get_normalized_stem(chunk[TEXT], language, normalized_stems)
+        for chunk in utterance[DATA]
         if ENTITY not in chunk or not is_builtin_entity(chunk[ENTITY])
     ]
 
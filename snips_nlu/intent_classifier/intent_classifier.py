@@ -1,7 +1,9 @@
 from abc import ABCMeta, abstractmethod
+from builtins import zip
 
 from future.utils import with_metaclass
 
+from snips_nlu.parsing_context import call_with_context
 from snips_nlu.pipeline.processing_unit import ProcessingUnit
 
 
@@ -21,7 +23,7 @@ class IntentClassifier(with_metaclass(ABCMeta, ProcessingUnit)):
         pass
 
     @abstractmethod
-    def get_intent(self, text, intents_filter):
+    def get_intent(self, text, intents_filter, context=None):
         """Performs intent classification on the provided *text*
 
         Args:
@@ -29,6 +31,8 @@ class IntentClassifier(with_metaclass(ABCMeta, ProcessingUnit)):
             intents_filter (str or list of str): When defined, it will find
                 the most likely intent among the list, otherwise it will use
                 the whole list of intents defined in the dataset
+            context (:class:`.ParsingContext`, optional): Artifacts computed
+                on *text* which are shared across processing units
 
         Returns:
             dict or None: The most likely intent along with its probability or
@@ -36,3 +40,19 @@ class IntentClassifier(with_metaclass(ABCMeta, ProcessingUnit)):
             :func:`.intent_classification_result` for the output format.
         """
         pass
+
+    def get_intent_batch(self, texts, intents_filter=None, contexts=None):
+        """Performs intent classification on a list of *texts*
+
+        The default implementation calls :meth:`get_intent` on each text,
+        intent classifiers may override it to process the whole batch at once.
+
+        Returns:
+            list of dict or None: The intent classification results, in the
+            same order as *texts*
+        """
+        if contexts is None:
+            return [self.get_intent(text, intents_filter) for text in texts]
+        return [call_with_context(self.get_intent, text, intents_filter,
+                                  context=context)
+                for text, context in zip(texts, contexts)]
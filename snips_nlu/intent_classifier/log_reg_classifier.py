@@ -31,6 +31,10 @@ LOG_REG_ARGS = {
     "n_jobs": -1
 }
 
+COEFFS_FILENAME = "coeffs.npy"
+INTERCEPT_FILENAME = "intercept.npy"
+FEATURIZER_DIRNAME = "featurizer"
+
 
 class LogRegIntentClassifier(IntentClassifier):
     """Intent classifier which uses a Logistic Regression underneath"""
@@ -48,6 +52,7 @@ class LogRegIntentClassifier(IntentClassifier):
         self.classifier = None
         self.intent_list = None
         self.featurizer = None
+        self._linear_weights = None
 
     # pylint:enable=line-too-long
 
@@ -94,7 +99,7 @@ class LogRegIntentClassifier(IntentClassifier):
         return self
 
     @fitted_required
-    def get_intent(self, text, intents_filter=None):
+    def get_intent(self, text, intents_filter=None, context=None):
         """Performs intent classification on the provided *text*
 
         Args:
@@ -102,6 +107,8 @@ class LogRegIntentClassifier(IntentClassifier):
             intents_filter (str or list of str): When defined, it will find
                 the most likely intent among the list, otherwise it will use
                 the whole list of intents defined in the dataset
+            context (:class:`.ParsingContext`, optional): Artifacts computed
+                on *text* which are shared across processing units
 
         Returns:
             dict or None: The most likely intent along with its probability or
@@ -124,10 +131,64 @@ class LogRegIntentClassifier(IntentClassifier):
             return intent_classification_result(self.intent_list[0], 1.0)
 
         # pylint: disable=C0103
-        X = self.featurizer.transform([text_to_utterance(text)])
+        X = self.featurizer.transform([text_to_utterance(text)],
+                                      contexts=[context])
         # pylint: enable=C0103
         proba_vec = self._predict_proba(X, intents_filter=intents_filter)
-        intents_probas = sorted(zip(self.intent_list, proba_vec[0]),
+        return self._get_most_likely_intent(proba_vec[0], intents_filter)
+
+    @fitted_required
+    def get_intent_batch(self, texts, intents_filter=None, contexts=None):
+        """Performs intent classification on a list of *texts*
+
+        The featurization and the classification are performed on the whole
+        batch at once, which is much faster than calling
+        :meth:`get_intent` on each text.
+
+        Args:
+            texts (list of str): Inputs
+            intents_filter (str or list of str): When defined, it will find
+                the most likely intent among the list, otherwise it will use
+                the whole list of intents defined in the dataset
+            contexts (list of :class:`.ParsingContext`, optional): Parsing
+                contexts of the *texts*
+
+        Returns:
+            list of dict or None: The intent classification results, in the
+            same order as *texts*
+
+        Raises:
+            NotTrained: When the intent classifier is not fitted
+        """
+        if isinstance(intents_filter, str):
+            intents_filter = [intents_filter]
+
+        if not self.intent_list or self.featurizer is None \
+                or self.classifier is None:
+            return [None for _ in texts]
+
+        if len(self.intent_list) == 1:
+            return [self.get_intent(text, intents_filter) for text in texts]
+
+        results = [None for _ in texts]
+        indexes = [i for i, text in enumerate(texts) if text]
+        if not indexes:
+            return results
+
+        utterances = [text_to_utterance(texts[i]) for i in indexes]
+        if contexts is not None:
+            contexts = [contexts[i] for i in indexes]
+        # pylint: disable=C0103
+        X = self.featurizer.transform(utterances, contexts=contexts)
+        # pylint: enable=C0103
+        probas = self._predict_proba(X, intents_filter=intents_filter)
+        for i, proba_vec in zip(indexes, probas):
+            results[i] = self._get_most_likely_intent(proba_vec,
+                                                      intents_filter)
+        return results
+
+    def _get_most_likely_intent(self, proba_vec, intents_filter):
+        intents_probas = sorted(zip(self.intent_list, proba_vec),
                                 key=lambda p: -p[1])
         for intent, proba in intents_probas:
             if intent is None:
@@ -137,36 +198,77 @@ class LogRegIntentClassifier(IntentClassifier):
         return None
 
     def _predict_proba(self, X, intents_filter):  # pylint: disable=C0103
-        self.classifier._check_proba()  # pylint: disable=W0212
+        weights, intercept = self._get_linear_weights()
+        if weights.shape[1] == 1:
+            prob = _sigmoid(X.dot(weights[:, 0]) + intercept[0])
+            return np.vstack([1 - prob, prob]).T
 
-        filtered_out_indexes = None
+        scored_indexes = None
         if intents_filter is not None:
-            filtered_out_indexes = [
+            scored_indexes = [
                 i for i, intent in enumerate(self.intent_list)
-                if intent not in intents_filter and intent is not None]
-
-        prob = self.classifier.decision_function(X)
-        prob *= -1
-        np.exp(prob, prob)
-        prob += 1
-        np.reciprocal(prob, prob)
-        if prob.ndim == 1:
-            return np.vstack([1 - prob, prob]).T
-        else:
-            if filtered_out_indexes:  # not None and not empty
-                prob[:, filtered_out_indexes] = 0.
-                # OvR normalization, like LibLinear's predict_probability
-                prob /= prob.sum(axis=1).reshape((prob.shape[0], -1))
+                if intent in intents_filter or intent is None]
+        if scored_indexes is None \
+                or len(scored_indexes) == len(self.intent_list):
             # We do not normalize when there is no intents filter, to keep the
             # probabilities calibrated
-            return prob
+            return _sigmoid(X.dot(weights) + intercept)
+
+        # Only the intents which are not filtered out are scored
+        prob = np.zeros((X.shape[0], len(self.intent_list)))
+        prob[:, scored_indexes] = _sigmoid(
+            X.dot(weights[:, scored_indexes]) + intercept[scored_indexes])
+        # OvR normalization, like LibLinear's predict_probability
+        prob /= prob.sum(axis=1).reshape((prob.shape[0], -1))
+        return prob
+
+    def _get_linear_weights(self):
+        # The weights of the logistic regression are stored as a contiguous
+        # (n_features, n_classes) matrix, so that the scores of a batch of
+        # sparse feature vectors are computed with a single product
+        if self._linear_weights is None \
+                or self._linear_weights[0] is not self.classifier:
+            weights = np.ascontiguousarray(self.classifier.coef_.T,
+                                           dtype=np.float32)
+            intercept = np.asarray(self.classifier.intercept_,
+                                   dtype=np.float32)
+            self._linear_weights = (self.classifier, weights, intercept)
+        return self._linear_weights[1:]
 
     @check_persisted_path
     def persist(self, path):
-        """Persist the object at the given path"""
+        """Persist the object at the given path
+
+        The weights of the classifier are saved in binary NumPy files, next
+        to a small json file holding the rest of the model.
+        """
         path = Path(path)
         path.mkdir()
-        classifier_json = json_string(self.to_dict())
+        coeffs_file = None
+        intercept_file = None
+        t_ = None
+        if self.classifier is not None:
+            coeffs_file = COEFFS_FILENAME
+            intercept_file = INTERCEPT_FILENAME
+            with (path / coeffs_file).open(mode="wb") as f:
+                np.save(f, self.classifier.coef_)
+            with (path / intercept_file).open(mode="wb") as f:
+                np.save(f, self.classifier.intercept_)
+            t_ = self.classifier.t_
+        featurizer_dir = None
+        if self.featurizer is not None:
+            featurizer_dir = FEATURIZER_DIRNAME
+            self.featurizer.persist(path / featurizer_dir)
+
+        model = {
+            "config": self.config.to_dict(),
+            "coeffs_file": coeffs_file,
+            "intercept_file": intercept_file,
+            "t_": t_,
+            "intent_list": self.intent_list,
+            "featurizer_dir": featurizer_dir,
+        }
+        classifier_json = json_string(model)
         with (path / "intent_classifier.json").open(mode="w") as f:
             f.write(classifier_json)
         self.persist_metadata(path)
@@ -176,7 +278,9 @@ class LogRegIntentClassifier(IntentClassifier):
         """Load a :class:`LogRegIntentClassifier` instance from a path
 
         The data at the given path must have been generated using
-        :func:`~LogRegIntentClassifier.persist`
+        :func:`~LogRegIntentClassifier.persist`. Models persisted in a single
+        json file, as generated by :func:`~LogRegIntentClassifier.to_dict`,
+        are also supported.
         """
         path = Path(path)
         model_path = path / "intent_classifier.json"
@@ -186,7 +290,27 @@ class LogRegIntentClassifier(IntentClassifier):
 
         with model_path.open(encoding="utf8") as f:
             model_dict = json.load(f)
-        return cls.from_dict(model_dict)
+        if "coeffs" in model_dict:
+            # Legacy format, where the whole model is stored in json
+            return cls.from_dict(model_dict)
+
+        config = LogRegIntentClassifierConfig.from_dict(model_dict["config"])
+        intent_classifier = cls(config=config)
+        coeffs_file = model_dict["coeffs_file"]
+        intercept_file = model_dict["intercept_file"]
+        if coeffs_file is not None and intercept_file is not None:
+            with (path / coeffs_file).open(mode="rb") as f:
+                coeffs = np.load(f, allow_pickle=False)
+            with (path / intercept_file).open(mode="rb") as f:
+                intercept = np.load(f, allow_pickle=False)
+            intent_classifier.classifier = _get_sgd_classifier(
+                coeffs, intercept, model_dict["t_"])
+        intent_classifier.intent_list = model_dict["intent_list"]
+        featurizer_dir = model_dict["featurizer_dir"]
+        if featurizer_dir is not None:
+            intent_classifier.featurizer = Featurizer.from_path(
+                path / featurizer_dir)
+        return intent_classifier
 
     @classmethod
     def from_dict(cls, unit_dict):
@@ -200,12 +324,9 @@ class LogRegIntentClassifier(IntentClassifier):
         sgd_classifier = None
         coeffs = unit_dict['coeffs']
         intercept = unit_dict['intercept']
-        t_ = unit_dict["t_"]
         if coeffs is not None and intercept is not None:
-            sgd_classifier = SGDClassifier(**LOG_REG_ARGS)
-            sgd_classifier.coef_ = np.array(coeffs)
-            sgd_classifier.intercept_ = np.array(intercept)
-            sgd_classifier.t_ = t_
+            sgd_classifier = _get_sgd_classifier(
+                np.array(coeffs), np.array(intercept), unit_dict["t_"])
         intent_classifier.classifier = sgd_classifier
         intent_classifier.intent_list = unit_dict['intent_list']
         featurizer = unit_dict['featurizer']
@@ -252,3 +373,19 @@ class LogRegIntentClassifier(IntentClassifier):
                 feature_weight = self.classifier.coef_[intent_ix, feature_ix]
                 log += "\n{} -> {}".format(feature_name, feature_weight)
         return log
+
+
+def _get_sgd_classifier(coeffs, intercept, t_):
+    sgd_classifier = SGDClassifier(**LOG_REG_ARGS)
+    sgd_classifier.coef_ = coeffs
+    sgd_classifier.intercept_ = intercept
+    sgd_classifier.t_ = t_
+    return sgd_classifier
+
+
+def _sigmoid(scores):
+    scores *= -1
+    np.exp(scores, scores)
+    scores += 1
+    np.reciprocal(scores, scores)
+    return scores
@@ -3,10 +3,11 @@ from __future__ import unicode_literals
 import json
 import logging
 import re
-from builtins import str
+from builtins import object, range, str, zip
+from collections import defaultdict
 from pathlib import Path
 
-from future.utils import iteritems
+from future.utils import iteritems, itervalues
 
 from snips_nlu.builtin_entities import (get_builtin_entities,
                                         is_builtin_entity)
@@ -21,12 +22,15 @@ from snips_nlu.result import (
     empty_result, intent_classification_result, parsing_result,
     unresolved_slot)
 from snips_nlu.utils import (
-    check_persisted_path, fitted_required, get_slot_name_mappings, json_string,
-    log_elapsed_time, log_result, ranges_overlap, regex_escape)
+    REGEX_PUNCT, check_persisted_path, fitted_required, get_slot_name_mappings,
+    json_string, log_elapsed_time, log_result, ranges_overlap, regex_escape)
 
 GROUP_NAME_PREFIX = "group"
 GROUP_NAME_SEPARATOR = "_"
 WHITESPACE_PATTERN = r"\s*"
+# Python < 3.5 does not support more than 100 groups in a regex
+MAX_GROUPS_PER_REGEX = 99
+_GROUP_START_REGEX = re.compile(r"\(\?P<\w+>")
 
 logger = logging.getLogger(__name__)
 
@@ -49,31 +53,47 @@ class DeterministicIntentParser(IntentParser):
             config = self.config_type()
         super(DeterministicIntentParser, self).__init__(config)
         self.language = None
-        self.regexes_per_intent = None
+        self._patterns = None
+        self._matchers_per_intent = dict()
+        self._regexes_per_intent = None
         self.group_names_to_slot_names = None
         self.slot_names_to_entities = None
+        self.entity_values = None
 
     @property
     def patterns(self):
         """Dictionary of patterns per intent"""
-        if self.regexes_per_intent is not None:
-            return {i: [r.pattern for r in regex_list] for i, regex_list in
-                    iteritems(self.regexes_per_intent)}
-        return None
+        return self._patterns
 
     @patterns.setter
     def patterns(self, value):
+        # The patterns are only compiled when an intent is parsed for the
+        # first time, which keeps the loading time low for large assistants
         if value is not None:
-            self.regexes_per_intent = dict()
-            for intent, pattern_list in iteritems(value):
-                regexes = [re.compile(r"%s" % p, re.IGNORECASE)
-                           for p in pattern_list]
-                self.regexes_per_intent[intent] = regexes
+            self._patterns = {intent: list(pattern_list)
+                              for intent, pattern_list in iteritems(value)}
+            self._matchers_per_intent = dict()
+            self._regexes_per_intent = None
+
+    @property
+    def regexes_per_intent(self):
+        """Dictionary of compiled regexes per intent
+
+        The regexes are compiled on first access only, and then memoized
+        until the patterns change
+        """
+        if self._patterns is None:
+            return None
+        if self._regexes_per_intent is None:
+            self._regexes_per_intent = {
+                intent: [re.compile(p, re.IGNORECASE) for p in pattern_list]
+                for intent, pattern_list in iteritems(self._patterns)}
+        return self._regexes_per_intent
 
     @property
     def fitted(self):
         """Whether or not the intent parser has already been trained"""
-        return self.regexes_per_intent is not None
+        return self._patterns is not None
 
     @log_elapsed_time(
         logger, logging.INFO, "Fitted deterministic parser in {elapsed_time}")
@@ -82,10 +102,16 @@ class DeterministicIntentParser(IntentParser):
         logger.info("Fitting deterministic parser...")
         dataset = validate_and_format_dataset(dataset)
         self.language = dataset[LANGUAGE]
-        self.regexes_per_intent = dict()
+        patterns_per_intent = dict()
         self.group_names_to_slot_names = dict()
-        joined_entity_utterances = _get_joined_entity_utterances(
-            dataset, self.language)
+        if self.config.use_entity_placeholders:
+            self.entity_values = _get_entity_values(dataset, self.language)
+            joined_entity_utterances = _get_joined_entity_placeholders(
+                dataset, self.entity_values, self.language)
+        else:
+            self.entity_values = None
+            joined_entity_utterances = _get_joined_entity_utterances(
+                dataset, self.language)
         self.slot_names_to_entities = get_slot_name_mappings(dataset)
         for intent_name, intent in iteritems(dataset[INTENTS]):
             utterances = intent[UTTERANCES]
@@ -94,16 +120,23 @@ class DeterministicIntentParser(IntentParser):
                 self.group_names_to_slot_names, self.language)
             patterns = [p for p in patterns
                         if len(p) < self.config.max_pattern_length]
-            patterns = patterns[:self.config.max_queries]
-            regexes = [re.compile(p, re.IGNORECASE) for p in patterns]
-            self.regexes_per_intent[intent_name] = regexes
+            patterns_per_intent[intent_name] = patterns[
+                :self.config.max_queries]
+        self.patterns = patterns_per_intent
         return self
 
+    def _get_matcher(self, intent):
+        matcher = self._matchers_per_intent.get(intent)
+        if matcher is None:
+            matcher = _IntentMatcher(self._patterns[intent])
+            self._matchers_per_intent[intent] = matcher
+        return matcher
+
     @log_result(
         logger, logging.DEBUG, "DeterministicIntentParser result -> {result}")
     @log_elapsed_time(logger, logging.DEBUG, "Parsed in {elapsed_time}.")
     @fitted_required
-    def parse(self, text, intents=None):
+    def parse(self, text, intents=None, context=None):
         """Performs intent parsing on the provided *text*
 
         Intent and slots are extracted simultaneously through pattern matching
@@ -112,6 +145,8 @@ class DeterministicIntentParser(IntentParser):
             text (str): Input
             intents (str or list of str): If provided, reduces the scope of
             intent parsing to the provided list of intents
+            context (:class:`.ParsingContext`, optional): Artifacts computed
+            on *text* which are shared across processing units
 
         Returns:
             dict: The matched intent, if any, along with the extracted slots.
@@ -125,37 +160,74 @@ class DeterministicIntentParser(IntentParser):
         if isinstance(intents, str):
             intents = [intents]
 
-        ranges_mapping, processed_text = _replace_builtin_entities(
-            text, self.language)
+        if context is not None:
+            builtin_entities = context.get_builtin_entities(use_cache=True)
+            tokens = context.tokens
+        else:
+            builtin_entities = get_builtin_entities(text, self.language,
+                                                    use_cache=True)
+            tokens = tokenize(text, self.language)
+
+        builtin_placeholders = _get_builtin_entities_placeholders(
+            builtin_entities, self.language)
+        custom_placeholders = []
+        if self.entity_values is not None:
+            custom_placeholders = _get_custom_entities_placeholders(
+                tokens, self.entity_values, self.language)
 
         # We try to match both the input text and the preprocessed text to
         # cover inconsistencies between labeled data and builtin entity parsing
-        cleaned_text = _replace_tokenized_out_characters(text, self.language)
+        ranges_mapping, processed_text = _replace_entities_with_placeholders(
+            text, builtin_placeholders + [
+                (rng, placeholder) for rng, placeholder in custom_placeholders
+                if not any(ranges_overlap(rng, builtin_rng)
+                           for builtin_rng, _ in builtin_placeholders)])
+        if custom_placeholders:
+            cleaned_ranges_mapping, cleaned_text = \
+                _replace_entities_with_placeholders(text, custom_placeholders)
+            cleaned_text = _replace_tokenized_out_characters(
+                cleaned_text, self.language)
+        else:
+            cleaned_ranges_mapping = None
+            cleaned_text = _replace_tokenized_out_characters(
+                text, self.language, tokens=tokens)
         cleaned_processed_text = _replace_tokenized_out_characters(
             processed_text, self.language)
 
-        for intent, regexes in iteritems(self.regexes_per_intent):
+        processed_first_tokens = _get_first_token_candidates(
+            cleaned_processed_text)
+        cleaned_first_tokens = _get_first_token_candidates(cleaned_text)
+        for intent in self._patterns:
             if intents is not None and intent not in intents:
                 continue
-            for regex in regexes:
-                res = self._get_matching_result(text, cleaned_processed_text,
-                                                regex, intent, ranges_mapping)
-                if res is None:
-                    res = self._get_matching_result(text, cleaned_text, regex,
-                                                    intent)
-                if res is not None:
-                    return res
+            matcher = self._get_matcher(intent)
+            # The patterns are tried in order, and for each of them the
+            # processed text is tried before the cleaned text
+            processed_index, processed_match = matcher.match(
+                cleaned_processed_text, processed_first_tokens)
+            if cleaned_text == cleaned_processed_text:
+                cleaned_index, cleaned_match = None, None
+            else:
+                cleaned_index, cleaned_match = matcher.match(
+                    cleaned_text, cleaned_first_tokens)
+            if processed_match is not None and (
+                    cleaned_match is None or processed_index <= cleaned_index):
+                return self._get_matching_result(
+                    text, processed_match, intent, ranges_mapping)
+            if cleaned_match is not None:
+                return self._get_matching_result(
+                    text, cleaned_match, intent, cleaned_ranges_mapping)
         return empty_result(text)
 
-    def _get_matching_result(self, text, processed_text, regex, intent,
+    def _get_matching_result(self, text, found_result, intent,
                              builtin_entities_ranges_mapping=None):
-        found_result = regex.match(processed_text)
-        if found_result is None:
-            return None
         parsed_intent = intent_classification_result(intent_name=intent,
                                                      probability=1.0)
         slots = []
-        for group_name in found_result.groupdict():
+        for group_name, group_value in iteritems(found_result.groupdict()):
+            if group_value is None:
+                # The group belongs to another pattern of the intent
+                continue
             slot_name = self.group_names_to_slot_names[group_name]
             entity = self.slot_names_to_entities[intent][slot_name]
             rng = (found_result.start(group_name),
@@ -211,13 +283,16 @@ class DeterministicIntentParser(IntentParser):
 
     def to_dict(self):
         """Returns a json-serializable dict"""
-        return {
+        parser_dict = {
             "config": self.config.to_dict(),
             "language_code": self.language,
             "patterns": self.patterns,
             "group_names_to_slot_names": self.group_names_to_slot_names,
             "slot_names_to_entities": self.slot_names_to_entities
         }
+        if self.config.use_entity_placeholders:
+            parser_dict["entity_values"] = self.entity_values
+        return parser_dict
 
     @classmethod
     def from_dict(cls, unit_dict):
@@ -233,12 +308,231 @@ class DeterministicIntentParser(IntentParser):
         parser.group_names_to_slot_names = unit_dict[
             "group_names_to_slot_names"]
         parser.slot_names_to_entities = unit_dict["slot_names_to_entities"]
+        parser.entity_values = unit_dict.get("entity_values")
         return parser
 
 
-def _replace_tokenized_out_characters(string, language, replacement_char=" "):
+class _IntentMatcher(object):
+    """Matches a text against the ordered patterns of an intent
+
+    The patterns are indexed by the first literal token they start with, so
+    that only the patterns which can start with the first word of the text
+    are tried. Patterns whose first token cannot be determined, typically
+    those starting with a custom entity, are always tried.
+    """
+
+    def __init__(self, patterns):
+        patterns_per_first_token = defaultdict(list)
+        fallback_patterns = []
+        for pattern_index, pattern in enumerate(patterns):
+            first_token = _get_pattern_first_token(pattern)
+            if first_token is None:
+                fallback_patterns.append((pattern_index, pattern))
+            else:
+                patterns_per_first_token[first_token].append(
+                    (pattern_index, pattern))
+        self._matchers_per_first_token = {
+            first_token: _PatternsMatcher(patterns)
+            for first_token, patterns in iteritems(patterns_per_first_token)}
+        self._fallback_matcher = _PatternsMatcher(fallback_patterns)
+
+    def match(self, text, first_tokens=None):
+        """Returns the index of the first pattern matching *text* along with
+        the corresponding match object, or (None, None) when no pattern
+        matches
+
+        The candidate *first_tokens* of *text*, as returned by
+        :func:`_get_first_token_candidates`, can be passed when they are
+        already available.
+        """
+        if first_tokens is None:
+            first_tokens = _get_first_token_candidates(text)
+        pattern_index, found_result = self._fallback_matcher.match(text)
+        for first_token in first_tokens:
+            matcher = self._matchers_per_first_token.get(first_token)
+            if matcher is None:
+                continue
+            index, found = matcher.match(text)
+            if found is not None and (
+                    found_result is None or index < pattern_index):
+                pattern_index, found_result = index, found
+        return pattern_index, found_result
+
+
+class _PatternsMatcher(object):
+    """Matches a text against a list of ordered patterns
+
+    The patterns are combined into alternation regexes, so that a text is
+    matched against all of them in a single call to the regex engine instead
+    of one call per pattern. Each pattern is wrapped in a capturing group,
+    which allows to find which pattern matched, as this group is the last one
+    to be closed.
+    """
+
+    def __init__(self, indexed_patterns):
+        self.regexes = []
+        self._patterns_indexes = []
+        alternatives = []
+        patterns_indexes = dict()
+        n_groups = 0
+        for pattern_index, pattern in indexed_patterns:
+            pattern_groups = _count_groups(pattern) + 1
+            if alternatives and \
+                    n_groups + pattern_groups > MAX_GROUPS_PER_REGEX:
+                self._add_regex(alternatives, patterns_indexes, n_groups)
+                alternatives = []
+                patterns_indexes = dict()
+                n_groups = 0
+            patterns_indexes[n_groups + 1] = pattern_index
+            alternatives.append(r"(%s)" % pattern)
+            n_groups += pattern_groups
+        if alternatives:
+            self._add_regex(alternatives, patterns_indexes, n_groups)
+
+    def _add_regex(self, alternatives, patterns_indexes, n_groups):
+        try:
+            regex = re.compile(r"|".join(alternatives), re.IGNORECASE)
+        except re.error:
+            # Patterns sharing a group name cannot be combined
+            regex = None
+        if regex is None or regex.groups != n_groups:
+            # The patterns are kept in separate regexes when they cannot be
+            # combined or when their groups were not counted properly
+            for alternative, (_, pattern_index) in zip(
+                    alternatives, sorted(iteritems(patterns_indexes))):
+                self.regexes.append(re.compile(alternative, re.IGNORECASE))
+                self._patterns_indexes.append({1: pattern_index})
+            return
+        self.regexes.append(regex)
+        self._patterns_indexes.append(patterns_indexes)
+
+    def match(self, text):
+        """Returns the index of the first pattern matching *text* along with
+        the corresponding match object, or (None, None) when no pattern
+        matches"""
+        for regex, patterns_indexes in zip(self.regexes,
+                                           self._patterns_indexes):
+            found_result = regex.match(text)
+            if found_result is not None:
+                return patterns_indexes[found_result.lastindex], found_result
+        return None, None
+
+
+def _get_pattern_first_token(pattern):
+    r"""Returns the lowercased literal token which starts all the texts matched
+    by *pattern*, or None when it cannot be determined
+
+    Only the patterns generated by :func:`_query_to_pattern` are analyzed,
+    that is to say patterns made of escaped tokens and of slot groups joined
+    by whitespaces. When the pattern starts with a slot group, the token is
+    only determined if the group has a single alternative.
+
+    Examples:
+
+        >>> _get_pattern_first_token(r"^\s*Turn\s*on\s*$")
+        'turn'
+        >>> _get_pattern_first_token(r"^\s*(?P<group_0>%SNIPSNUMBER%)\s*$")
+        '%snipsnumber%'
+        >>> _get_pattern_first_token(r"^\s*(?P<group_1>foo|bar)\s*$") is None
+        True
+    """
+    prefix = "^" + WHITESPACE_PATTERN
+    if not pattern.startswith(prefix):
+        return None
+    i = len(prefix)
+    group_start = _GROUP_START_REGEX.match(pattern, i)
+    if group_start is not None:
+        i = group_start.end()
+        group_end = _get_group_end(pattern, i)
+        if group_end is None or "|" in _unescaped_chars(pattern[i:group_end]):
+            return None
+    token = ""
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern) \
+                and pattern[i + 1] in REGEX_PUNCT:
+            token += pattern[i + 1]
+            i += 2
+        elif char == "\\" or char in REGEX_PUNCT:
+            break
+        else:
+            token += char
+            i += 1
+    # The token must be followed by a separator, the end of the slot group or
+    # the end of the pattern, otherwise it may be modified by a quantifier
+    if not token or not (pattern.startswith(WHITESPACE_PATTERN, i)
+                         or pattern.startswith(")", i)
+                         or pattern.startswith("$", i)):
+        return None
+    return token.lower()
+
+
+def _count_groups(pattern):
+    """Counts the capturing groups of *pattern* without compiling it"""
+    n_groups = 0
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(" and (not pattern.startswith("?", i + 1)
+                              or pattern.startswith("?P<", i + 1)):
+            n_groups += 1
+        i += 1
+    return n_groups
+
+
+def _get_group_end(pattern, start):
+    i = start
+    while i < len(pattern):
+        if pattern[i] == "\\":
+            i += 2
+            continue
+        if pattern[i] == "(":
+            return None
+        if pattern[i] == ")":
+            return i
+        i += 1
+    return None
+
+
+def _unescaped_chars(pattern):
+    chars = []
+    i = 0
+    while i < len(pattern):
+        if pattern[i] == "\\":
+            i += 2
+            continue
+        chars.append(pattern[i])
+        i += 1
+    return chars
+
+
+def _get_first_token_candidates(text):
+    """Returns all the prefixes of the lowercased first word of *text*
+
+    As tokens are joined with optional whitespaces in the patterns, the first
+    token of a matched text may be only a prefix of its first word.
+    """
+    words = text.split(None, 1)
+    if not words:
+        return []
+    first_word = words[0].lower()
+    return [first_word[:i] for i in range(1, len(first_word) + 1)]
+
+
+def _replace_tokenized_out_characters(string, language, replacement_char=" ",
+                                      tokens=None):
     """Replace all characters that are tokenized out by `replacement_char`
 
+    The *tokens* of *string* can be passed when they are already available.
+
     Examples:
 
         >>> string = "hello, it's me"
@@ -248,7 +542,8 @@ def _replace_tokenized_out_characters(string, language, replacement_char=" "):
         >>> _replace_tokenized_out_characters(string, language, "_")
         'hello__it_s_me'
     """
-    tokens = tokenize(string, language)
+    if tokens is None:
+        tokens = tokenize(string, language)
     current_idx = 0
     cleaned_string = ""
     for token in tokens:
@@ -369,6 +664,74 @@ def _get_joined_entity_utterances(dataset, language):
     return joined_entity_utterances
 
 
+def _get_entity_values(dataset, language):
+    """Maps the normalized values of the custom entities to the sorted list of
+    entities they belong to"""
+    entity_values = dict()
+    for entity_name, entity in iteritems(dataset[ENTITIES]):
+        if is_builtin_entity(entity_name):
+            continue
+        for utterance in entity[UTTERANCES]:
+            value = _normalize_entity_value(utterance, language)
+            if value:
+                entity_values.setdefault(value, set()).add(entity_name)
+    return {value: sorted(entities)
+            for value, entities in iteritems(entity_values)}
+
+
+def _get_joined_entity_placeholders(dataset, entity_values, language):
+    # A value which belongs to several entities is replaced by a placeholder
+    # representing all of them, which must be accepted by each entity
+    entities_lists = set(tuple(entities) for entities in
+                         itervalues(entity_values))
+    joined_entity_placeholders = dict()
+    for entity_name in dataset[ENTITIES]:
+        if is_builtin_entity(entity_name):
+            placeholders = [_get_entity_name_placeholder(entity_name,
+                                                         language)]
+        else:
+            placeholders = [
+                _get_entities_placeholder(entities, language)
+                for entities in entities_lists if entity_name in entities]
+        joined_entity_placeholders[entity_name] = r"|".join(
+            sorted((regex_escape(p) for p in placeholders), key=len,
+                   reverse=True))
+    return joined_entity_placeholders
+
+
+def _get_custom_entities_placeholders(tokens, entity_values, language):
+    """Finds the custom entity values in *tokens* and returns their ranges
+    along with their placeholders
+
+    The longest values are matched first, and matched values do not overlap.
+    """
+    normalized_tokens = [token.value.lower() for token in tokens]
+    matches = []
+    for start in range(len(tokens)):
+        for end in range(start + 1, len(tokens) + 1):
+            value = " ".join(normalized_tokens[start:end])
+            if value in entity_values:
+                matches.append((start, end))
+    matches = sorted(matches, key=lambda m: (m[0] - m[1], m[0]))
+    matched_tokens = [False for _ in tokens]
+    placeholders = []
+    for start, end in matches:
+        if any(matched_tokens[start:end]):
+            continue
+        for i in range(start, end):
+            matched_tokens[i] = True
+        value = " ".join(normalized_tokens[start:end])
+        rng = {START: tokens[start].start, END: tokens[end - 1].end}
+        placeholder = _get_entities_placeholder(entity_values[value],
+                                                language)
+        placeholders.append((rng, placeholder))
+    return placeholders
+
+
+def _normalize_entity_value(value, language):
+    return " ".join(t.lower() for t in tokenize_light(value, language))
+
+
 def _deduplicate_overlapping_slots(slots, language):
     deduplicated_slots = []
     for slot in slots:
@@ -394,34 +757,52 @@ def _get_entity_name_placeholder(entity_label, language):
         tokenize_light(entity_label, language)).upper()
 
 
-def _replace_builtin_entities(text, language):
-    builtin_entities = get_builtin_entities(text, language, use_cache=True)
+def _get_entities_placeholder(entity_labels, language):
+    return "%%%s%%" % "%".join(
+        "".join(tokenize_light(label, language)).upper()
+        for label in entity_labels)
+
+
+def _replace_builtin_entities(text, language, builtin_entities=None):
+    if builtin_entities is None:
+        builtin_entities = get_builtin_entities(text, language,
+                                                use_cache=True)
     if not builtin_entities:
         return dict(), text
+    return _replace_entities_with_placeholders(
+        text, _get_builtin_entities_placeholders(builtin_entities, language))
+
+
+def _get_builtin_entities_placeholders(builtin_entities, language):
+    return [(ent[RES_MATCH_RANGE],
+             _get_entity_name_placeholder(ent[ENTITY_KIND], language))
+            for ent in builtin_entities]
+
+
+def _replace_entities_with_placeholders(text, entities_placeholders):
+    if not entities_placeholders:
+        return dict(), text
 
     range_mapping = dict()
     processed_text = ""
     offset = 0
     current_ix = 0
-    builtin_entities = sorted(builtin_entities,
-                              key=lambda e: e[RES_MATCH_RANGE][START])
-    for ent in builtin_entities:
-        ent_start = ent[RES_MATCH_RANGE][START]
-        ent_end = ent[RES_MATCH_RANGE][END]
+    entities_placeholders = sorted(entities_placeholders,
+                                   key=lambda e: e[0][START])
+    for rng, entity_place_holder in entities_placeholders:
+        ent_start = rng[START]
+        ent_end = rng[END]
         rng_start = ent_start + offset
 
         processed_text += text[current_ix:ent_start]
 
         entity_length = ent_end - ent_start
-        entity_place_holder = _get_entity_name_placeholder(ent[ENTITY_KIND],
-                                                           language)
-
         offset += len(entity_place_holder) - entity_length
 
         processed_text += entity_place_holder
         rng_end = ent_end + offset
         new_range = (rng_start, rng_end)
-        range_mapping[new_range] = ent[RES_MATCH_RANGE]
+        range_mapping[new_range] = rng
         current_ix = ent_end
 
     processed_text += text[current_ix:]
@@ -1,7 +1,9 @@
 from abc import ABCMeta, abstractmethod, abstractproperty
+from builtins import zip
 
 from future.utils import with_metaclass
 
+from snips_nlu.parsing_context import call_with_context
 from snips_nlu.pipeline.processing_unit import ProcessingUnit
 
 
@@ -29,16 +31,39 @@ class IntentParser(with_metaclass(ABCMeta, ProcessingUnit)):
         pass
 
     @abstractmethod
-    def parse(self, text, intents):
+    def parse(self, text, intents, context=None):
         """Performs intent parsing on the provide *text*
 
         Args:
             text (str): Input
             intents (str or list of str): If provided, reduces the scope of
             intent parsing to the provided list of intents
+            context (:class:`.ParsingContext`, optional): Artifacts computed
+            on *text* which are shared across processing units
 
         Returns:
             dict: The most likely intent along with the extracted slots. See
             :func:`.parsing_result` for the output format.
         """
         pass
+
+    def parse_batch(self, texts, intents=None, contexts=None):
+        """Performs intent parsing on a list of *texts*
+
+        The default implementation calls :meth:`parse` on each text, intent
+        parsers may override it to process the whole batch at once.
+
+        Args:
+            texts (list of str): Inputs
+            intents (str or list of str): If provided, reduces the scope of
+            intent parsing to the provided list of intents
+            contexts (list of :class:`.ParsingContext`, optional): Parsing
+            contexts of the *texts*
+
+        Returns:
+            list of dict: The parsing results, in the same order as *texts*
+        """
+        if contexts is None:
+            return [self.parse(text, intents) for text in texts]
+        return [call_with_context(self.parse, text, intents, context=context)
+                for text, context in zip(texts, contexts)]
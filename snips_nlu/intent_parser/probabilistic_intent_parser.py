@@ -2,19 +2,26 @@ from __future__ import unicode_literals
 
 import json
 import logging
-from builtins import str
+import shutil
+import tempfile
+from builtins import str, zip
+from collections import defaultdict
 from copy import deepcopy
 from datetime import datetime
+from multiprocessing import Pool, cpu_count
 from pathlib import Path
 
 from future.utils import iteritems, itervalues
 
-from snips_nlu.constants import INTENTS, RES_INTENT_NAME
+from snips_nlu.constants import INTENTS, LANGUAGE, RES_INTENT_NAME
 from snips_nlu.dataset import validate_and_format_dataset
 from snips_nlu.intent_parser.intent_parser import IntentParser
+from snips_nlu.parsing_context import call_with_context
 from snips_nlu.pipeline.configs import ProbabilisticIntentParserConfig
 from snips_nlu.pipeline.processing_unit import (
     build_processing_unit, load_processing_unit)
+from snips_nlu.resources import (
+    MissingResource, get_resources_dir, load_resources_from_dir)
 from snips_nlu.result import empty_result, parsing_result
 from snips_nlu.utils import (check_persisted_path, elapsed_since,
                              fitted_required, json_string, log_elapsed_time,
@@ -77,6 +84,7 @@ class ProbabilisticIntentParser(IntentParser):
         if self.slot_fillers is None:
             self.slot_fillers = dict()
         slot_fillers_start = datetime.now()
+        intents_to_fit = []
         for intent_name in intents:
             # We need to copy the slot filler config as it may be mutated
             if self.slot_fillers.get(intent_name) is None:
@@ -84,6 +92,16 @@ class ProbabilisticIntentParser(IntentParser):
                 self.slot_fillers[intent_name] = build_processing_unit(
                     slot_filler_config)
             if force_retrain or not self.slot_fillers[intent_name].fitted:
+                intents_to_fit.append(intent_name)
+
+        n_jobs = self.config.n_jobs
+        if n_jobs == -1:
+            n_jobs = cpu_count()
+        n_jobs = min(n_jobs, len(intents_to_fit))
+        if n_jobs > 1:
+            self._fit_slot_fillers_in_parallel(dataset, intents_to_fit, n_jobs)
+        else:
+            for intent_name in intents_to_fit:
                 self.slot_fillers[intent_name].fit(dataset, intent_name)
         logger.debug("Fitted slot fillers in %s",
                      elapsed_since(slot_fillers_start))
@@ -91,12 +109,41 @@ class ProbabilisticIntentParser(IntentParser):
 
     # pylint:enable=arguments-differ
 
+    def _fit_slot_fillers_in_parallel(self, dataset, intents, n_jobs):
+        # Each slot filler is fitted and persisted by a worker process, and
+        # then loaded back in the current process. The slot fillers are fitted
+        # exactly as they would be sequentially, hence the results are the
+        # same for a fixed random seed.
+        try:
+            resources_dir = get_resources_dir(dataset[LANGUAGE])
+        except MissingResource:
+            resources_dir = None
+        models_dir = Path(tempfile.mkdtemp())
+        try:
+            tasks = [(self.slot_fillers[intent_name].config, intent_name,
+                      str(models_dir / ("slot_filler_%s" % i)))
+                     for i, intent_name in enumerate(intents)]
+            # The dataset is shared with the workers when they are forked,
+            # instead of being sent along with each task
+            pool = Pool(n_jobs, initializer=_init_slot_filler_worker,
+                        initargs=(dataset, resources_dir))
+            try:
+                pool.map(_fit_slot_filler, tasks)
+            finally:
+                pool.close()
+                pool.join()
+            for _, intent_name, slot_filler_path in tasks:
+                self.slot_fillers[intent_name] = load_processing_unit(
+                    slot_filler_path)
+        finally:
+            shutil.rmtree(str(models_dir))
+
     @log_result(logger, logging.DEBUG,
                 "ProbabilisticIntentParser result -> {result}")
     @log_elapsed_time(logger, logging.DEBUG,
                       "ProbabilisticIntentParser parsed in {elapsed_time}")
     @fitted_required
-    def parse(self, text, intents=None):
+    def parse(self, text, intents=None, context=None):
         """Performs intent parsing on the provided *text* by first classifying
         the intent and then using the correspond slot filler to extract slots
 
@@ -104,6 +151,8 @@ class ProbabilisticIntentParser(IntentParser):
             text (str): Input
             intents (str or list of str): If provided, reduces the scope of
                 intent parsing to the provided list of intents
+            context (:class:`.ParsingContext`, optional): Artifacts computed
+                on *text* which are shared across processing units
 
         Returns:
             dict: The most likely intent along with the extracted slots. See
@@ -117,14 +166,66 @@ class ProbabilisticIntentParser(IntentParser):
         if isinstance(intents, str):
             intents = [intents]
 
-        intent_result = self.intent_classifier.get_intent(text, intents)
+        intent_result = call_with_context(
+            self.intent_classifier.get_intent, text, intents, context=context)
         if intent_result is None:
             return empty_result(text)
 
         intent_name = intent_result[RES_INTENT_NAME]
-        slots = self.slot_fillers[intent_name].get_slots(text)
+        slots = call_with_context(self.slot_fillers[intent_name].get_slots,
+                                  text, context=context)
         return parsing_result(text, intent_result, slots)
 
+    @log_elapsed_time(
+        logger, logging.DEBUG,
+        "ProbabilisticIntentParser parsed batch in {elapsed_time}")
+    @fitted_required
+    def parse_batch(self, texts, intents=None, contexts=None):
+        """Performs intent parsing on a list of *texts*
+
+        The intents of the whole batch are classified at once, then the texts
+        are grouped by predicted intent and dispatched to the corresponding
+        slot filler.
+
+        Args:
+            texts (list of str): Inputs
+            intents (str or list of str): If provided, reduces the scope of
+                intent parsing to the provided list of intents
+            contexts (list of :class:`.ParsingContext`, optional): Parsing
+                contexts of the *texts*
+
+        Returns:
+            list of dict: The parsing results, in the same order as *texts*
+
+        Raises:
+            NotTrained: When the intent parser is not fitted
+        """
+        if isinstance(intents, str):
+            intents = [intents]
+
+        if contexts is None:
+            contexts = [None for _ in texts]
+
+        intent_results = call_with_context(
+            self.intent_classifier.get_intent_batch, texts, intents,
+            contexts=contexts)
+        indexes_per_intent = defaultdict(list)
+        for i, intent_result in enumerate(intent_results):
+            if intent_result is not None:
+                intent_name = intent_result[RES_INTENT_NAME]
+                indexes_per_intent[intent_name].append(i)
+
+        results = [empty_result(text) for text in texts]
+        for intent_name, indexes in iteritems(indexes_per_intent):
+            batch_slots = call_with_context(
+                self.slot_fillers[intent_name].get_slots_batch,
+                [texts[i] for i in indexes],
+                contexts=[contexts[i] for i in indexes])
+            for i, slots in zip(indexes, batch_slots):
+                results[i] = parsing_result(texts[i], intent_results[i],
+                                            slots)
+        return results
+
     @check_persisted_path
     def persist(self, path):
         """Persist the object at the given path"""
@@ -185,3 +286,25 @@ class ProbabilisticIntentParser(IntentParser):
         parser.intent_classifier = classifier
         parser.slot_fillers = slot_fillers
         return parser
+
+
+# State of the slot filler fitting workers
+_WORKER_STATE = dict()
+
+
+def _init_slot_filler_worker(dataset, resources_dir):
+    if resources_dir is not None:
+        # Forked workers inherit the resources of the parent process, only the
+        # spawned ones need to load them
+        try:
+            get_resources_dir(dataset[LANGUAGE])
+        except MissingResource:
+            load_resources_from_dir(Path(resources_dir))
+    _WORKER_STATE["dataset"] = dataset
+
+
+def _fit_slot_filler(task):
+    slot_filler_config, intent_name, slot_filler_path = task
+    slot_filler = build_processing_unit(slot_filler_config)
+    slot_filler.fit(_WORKER_STATE["dataset"], intent_name)
+    slot_filler.persist(slot_filler_path)
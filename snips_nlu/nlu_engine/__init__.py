@@ -1 +1,2 @@
 from .nlu_engine import SnipsNLUEngine
+from .worker_pool import EngineWorkerPool
@@ -0,0 +1,113 @@
+from __future__ import unicode_literals
+
+import logging
+from builtins import object, str, zip
+from collections import defaultdict
+from functools import partial
+
+try:
+    import asyncio
+except ImportError:  # Python 2
+    asyncio = None
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncParseBatcher(object):
+    """asyncio front end which groups concurrent parsing requests into
+    batches
+
+    Queries submitted within a time window of *batch_window* seconds are
+    gathered and parsed at once with :meth:`.SnipsNLUEngine.parse_batch` in
+    an executor, so that the event loop is never blocked by the parsing. Each
+    submitted query gets a future which is resolved with its own parsing
+    result.
+
+    Args:
+        engine (:class:`.SnipsNLUEngine`): Fitted engine used for parsing
+        batch_window (float, optional): Time, in seconds, during which
+            queries are gathered before being parsed. Defaults to 5ms.
+        max_batch_size (int, optional): A batch is parsed as soon as it
+            reaches this size, without waiting for the end of the time
+            window. Defaults to 64.
+        executor (:class:`concurrent.futures.Executor`, optional): Executor
+            in which batches are parsed, defaults to the default executor
+            of the event loop
+        loop (:class:`asyncio.AbstractEventLoop`, optional): Event loop in
+            which queries are batched. By default, the current event loop is
+            looked up on each submission, so that the same batcher can be
+            used from successive event loops.
+    """
+
+    def __init__(self, engine, batch_window=0.005, max_batch_size=64,
+                 executor=None, loop=None):
+        if asyncio is None:
+            raise ImportError(
+                "AsyncParseBatcher requires asyncio, which is only available "
+                "with python>=3.4")
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1, found %s"
+                             % max_batch_size)
+        self.engine = engine
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.executor = executor
+        self.loop = loop
+        self._pending = defaultdict(list)
+        self._flush_handles = dict()
+
+    def submit(self, text, intents=None):
+        """Schedules the parsing of *text* in the next batch
+
+        Returns:
+            :class:`asyncio.Future`: A future resolved with the parsing
+            result, see :meth:`.SnipsNLUEngine.parse`
+        """
+        if isinstance(intents, str):
+            intents = [intents]
+        loop = self.loop if self.loop is not None \
+            else asyncio.get_event_loop()
+        # Queries are only batched with queries submitted in the same event
+        # loop and having the same intents filter
+        key = (loop, tuple(intents) if intents is not None else None)
+        future = asyncio.Future(loop=loop)
+        self._pending[key].append((text, future))
+        if len(self._pending[key]) >= self.max_batch_size:
+            self._flush(key)
+        elif key not in self._flush_handles:
+            self._flush_handles[key] = loop.call_later(
+                self.batch_window, self._flush, key)
+        return future
+
+    def _flush(self, key):
+        handle = self._flush_handles.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+        requests = self._pending.pop(key, [])
+        if not requests:
+            return
+        loop, intents = key
+        texts = [text for text, _ in requests]
+        futures = [future for _, future in requests]
+        intents = list(intents) if intents is not None else None
+        logger.debug("Parsing batch of %s queries", len(texts))
+        batch_future = loop.run_in_executor(
+            self.executor, self.engine.parse_batch, texts, intents)
+        batch_future.add_done_callback(partial(_resolve_futures, futures))
+
+
+def _resolve_futures(futures, batch_future):
+    if batch_future.cancelled():
+        # e.g. when the event loop is shut down before the batch is parsed
+        for future in futures:
+            future.cancel()
+        return
+    exception = batch_future.exception()
+    if exception is not None:
+        for future in futures:
+            if not future.done():
+                future.set_exception(exception)
+        return
+    for future, result in zip(futures, batch_future.result()):
+        if not future.done():
+            future.set_result(result)
@@ -2,10 +2,11 @@ from __future__ import unicode_literals
 
 import json
 import logging
-from builtins import str
+from builtins import str, zip
 from collections import defaultdict
 from copy import deepcopy
 from pathlib import Path
+from time import time
 
 from future.utils import iteritems
 
@@ -15,7 +16,11 @@ from snips_nlu.constants import (
     CAPITALIZE, ENTITIES, LANGUAGE, RES_ENTITY, RES_INTENT, RES_SLOTS)
 from snips_nlu.dataset import validate_and_format_dataset
 from snips_nlu.default_configs import DEFAULT_CONFIGS
-from snips_nlu.nlu_engine.utils import resolve_slots
+from snips_nlu.nlu_engine.async_batcher import AsyncParseBatcher
+from snips_nlu.nlu_engine.result_cache import CachedParsing
+from snips_nlu.nlu_engine.utils import (
+    get_resolution_builtin_entities, resolve_slot)
+from snips_nlu.parsing_context import ParsingContext, call_with_context
 from snips_nlu.pipeline.configs import NLUEngineConfig
 from snips_nlu.pipeline.processing_unit import (
     ProcessingUnit, build_processing_unit, load_processing_unit)
@@ -57,6 +62,11 @@ class SnipsNLUEngine(ProcessingUnit):
         super(SnipsNLUEngine, self).__init__(config)
         self.intent_parsers = []
         """list of :class:`.IntentParser`"""
+        self.async_batcher = None
+        """:class:`.AsyncParseBatcher` used by :meth:`parse_async`"""
+        self.result_cache = None
+        """optional :class:`.ParseResultCache` used by :meth:`parse` and
+        :meth:`parse_batch`"""
         self._dataset_metadata = None
 
     @property
@@ -100,6 +110,8 @@ class SnipsNLUEngine(ProcessingUnit):
             parsers.append(recycled_parser)
 
         self.intent_parsers = parsers
+        if self.result_cache is not None:
+            self.result_cache.clear()
         return self
 
     @log_result(logger, logging.DEBUG, "Result -> {result}")
@@ -129,22 +141,183 @@ class SnipsNLUEngine(ProcessingUnit):
         if isinstance(intents, str):
             intents = [intents]
 
-        language = self._dataset_metadata["language_code"]
-        entities = self._dataset_metadata["entities"]
+        if self.result_cache is not None:
+            cached_parsing = self.result_cache.get(text, intents)
+            if cached_parsing is not None:
+                return self._resolve_cached_parsing(text, intents,
+                                                    cached_parsing)
 
+        language = self._dataset_metadata["language_code"]
+        context = ParsingContext(text, language)
         for parser in self.intent_parsers:
-            res = parser.parse(text, intents)
+            res = call_with_context(parser.parse, text, intents,
+                                    context=context)
             if is_empty(res):
                 continue
-            slots = res[RES_SLOTS]
-            scope = [s[RES_ENTITY] for s in slots
-                     if is_builtin_entity(s[RES_ENTITY])]
-            resolved_slots = resolve_slots(text, slots, entities, language,
-                                           scope)
-            return parsing_result(text, intent=res[RES_INTENT],
-                                  slots=resolved_slots)
+            return self._resolve_parsing_result(text, res, context, intents)
+        return self._empty_result(text, intents)
+
+    @log_elapsed_time(logger, logging.DEBUG,
+                      "Parsed batch of queries in {elapsed_time}")
+    @fitted_required
+    def parse_batch(self, texts, intents=None):
+        """Performs intent parsing on a list of *texts*
+
+        This is equivalent to calling :meth:`parse` on each text, but each
+        intent parser processes the whole batch at once, which allows to
+        vectorize the intent classification and to group slot filling by
+        intent. Texts which are not parsed by an intent parser are forwarded
+        to the next one.
+
+        Args:
+            texts (list of str): Inputs
+            intents (str or list of str): If provided, reduces the scope of
+                intent parsing to the provided list of intents
+
+        Returns:
+            list of dict: The parsing results, in the same order as *texts*.
+            See :func:`.parsing_result` for the output format.
+
+        Raises:
+            NotTrained: When the nlu engine is not fitted
+            TypeError: When one of the inputs is not unicode
+        """
+        logging.info("NLU engine parsing batch of %s queries...", len(texts))
+        for text in texts:
+            if not isinstance(text, str):
+                raise TypeError("Expected unicode but received: %s"
+                                % type(text))
+
+        if isinstance(intents, str):
+            intents = [intents]
+
+        results = [None for _ in texts]
+        remaining_indexes = []
+        for i, text in enumerate(texts):
+            if self.result_cache is not None:
+                cached_parsing = self.result_cache.get(text, intents)
+                if cached_parsing is not None:
+                    results[i] = self._resolve_cached_parsing(
+                        text, intents, cached_parsing)
+                    continue
+            remaining_indexes.append(i)
+
+        language = self._dataset_metadata["language_code"]
+        contexts = [ParsingContext(text, language) for text in texts]
+        for parser in self.intent_parsers:
+            if not remaining_indexes:
+                break
+            batch = [texts[i] for i in remaining_indexes]
+            batch_contexts = [contexts[i] for i in remaining_indexes]
+            batch_results = call_with_context(
+                parser.parse_batch, batch, intents, contexts=batch_contexts)
+            unparsed_indexes = []
+            for i, res in zip(remaining_indexes, batch_results):
+                if is_empty(res):
+                    unparsed_indexes.append(i)
+                    continue
+                results[i] = self._resolve_parsing_result(
+                    texts[i], res, contexts[i], intents)
+            remaining_indexes = unparsed_indexes
+
+        for i in remaining_indexes:
+            results[i] = self._empty_result(texts[i], intents)
+        return results
+
+    @fitted_required
+    def parse_async(self, text, intents=None):
+        """Schedules the intent parsing of *text* without blocking the asyncio
+        event loop
+
+        Concurrent queries are gathered in micro-batches which are parsed with
+        :meth:`parse_batch` in an executor. Unless :attr:`async_batcher` has
+        been set beforehand, an :class:`.AsyncParseBatcher` with default
+        parameters is created, which batches the queries of each event loop
+        separately.
+
+        This requires python>=3.4:
+
+        .. code-block:: python
+
+            result = await engine.parse_async(u"Turn on the lights")
+
+        Args:
+            text (str): Input
+            intents (str or list of str): If provided, reduces the scope of
+                intent parsing to the provided list of intents
+
+        Returns:
+            :class:`asyncio.Future`: A future resolved with the parsing result.
+            See :func:`.parsing_result` for the output format.
+
+        Raises:
+            NotTrained: When the nlu engine is not fitted
+            TypeError: When input type is not unicode
+            ImportError: When asyncio is not available (python<3.4)
+        """
+        if not isinstance(text, str):
+            raise TypeError("Expected unicode but received: %s" % type(text))
+        if self.async_batcher is None:
+            self.async_batcher = AsyncParseBatcher(self)
+        return self.async_batcher.submit(text, intents)
+
+    def _resolve_parsing_result(self, text, result, context=None,
+                                intents=None):
+        slots = result[RES_SLOTS]
+        resolved_slots = self._resolve_slots(text, slots, context)
+        if self.result_cache is not None:
+            self.result_cache.put(text, intents, CachedParsing(
+                deepcopy(result[RES_INTENT]), deepcopy(slots),
+                deepcopy(resolved_slots), time()))
+        return parsing_result(text, intent=result[RES_INTENT], slots=[
+            slot for slot in resolved_slots if slot is not None])
+
+    def _empty_result(self, text, intents=None):
+        if self.result_cache is not None:
+            self.result_cache.put(text, intents,
+                                  CachedParsing(None, [], [], time()))
         return empty_result(text)
 
+    def _resolve_cached_parsing(self, text, intents, cached_parsing):
+        if cached_parsing.intent is None:
+            return empty_result(text)
+        resolved_slots = cached_parsing.resolved_slots
+        ttl = self.result_cache.builtin_slots_ttl
+        has_builtin_slots = any(is_builtin_entity(slot[RES_ENTITY])
+                                for slot in cached_parsing.slots)
+        if has_builtin_slots and (
+                ttl is None or time() - cached_parsing.resolution_time > ttl):
+            # Custom slots values do not depend on the time, hence only the
+            # builtin slots are resolved again
+            builtin_slots = self._resolve_slots(
+                text, cached_parsing.slots, builtin_slots_only=True)
+            resolved_slots = [
+                builtin_slot if is_builtin_entity(slot[RES_ENTITY])
+                else resolved_slot for slot, resolved_slot, builtin_slot in
+                zip(cached_parsing.slots, resolved_slots, builtin_slots)]
+            if ttl is not None:
+                self.result_cache.put(text, intents, cached_parsing._replace(
+                    resolved_slots=resolved_slots, resolution_time=time()))
+        # The cached objects must not be exposed as they could be mutated
+        return parsing_result(
+            text, intent=deepcopy(cached_parsing.intent),
+            slots=[deepcopy(slot) for slot in resolved_slots
+                   if slot is not None])
+
+    def _resolve_slots(self, text, slots, context=None,
+                       builtin_slots_only=False):
+        language = self._dataset_metadata["language_code"]
+        entities = self._dataset_metadata["entities"]
+        scope = [s[RES_ENTITY] for s in slots
+                 if is_builtin_entity(s[RES_ENTITY])]
+        builtin_entities = get_resolution_builtin_entities(
+            text, language, scope, context)
+        return [
+            resolve_slot(slot, entities, language, builtin_entities)
+            if not builtin_slots_only or is_builtin_entity(slot[RES_ENTITY])
+            else None
+            for slot in slots]
+
     @check_persisted_path
     def persist(self, path):
         """Persist the NLU engine at the given directory path
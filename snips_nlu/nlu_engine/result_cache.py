@@ -0,0 +1,92 @@
+from __future__ import unicode_literals
+
+from builtins import object
+from collections import namedtuple
+from threading import Lock
+
+from snips_nlu.utils import LimitedSizeDict
+
+CachedParsing = namedtuple(
+    "CachedParsing", ["intent", "slots", "resolved_slots", "resolution_time"])
+"""Parsing of a query stored in a :class:`ParseResultCache`
+
+Attributes:
+    intent (dict): Intent classification result, or None when no intent was
+        found
+    slots (list of dict): Unresolved slots
+    resolved_slots (list of dict): Resolved slots, aligned with *slots* and
+        containing None for the slots which could not be resolved
+    resolution_time (float): Time, as returned by :func:`time.time`, at
+        which the slots were resolved
+"""
+
+
+class ParseResultCache(object):
+    """Thread-safe LRU cache of the parsing results of a
+    :class:`.SnipsNLUEngine`
+
+    The cache is keyed on the input text and the intents filter. Intent
+    classification results and custom slots values are cached until they are
+    evicted, whereas builtin slots values, such as datetimes, may depend on
+    the current time. The latter are thus resolved again on each cache hit,
+    unless a *builtin_slots_ttl* is provided, in which case they are only
+    resolved again when they are older than this duration.
+
+    Args:
+        size_limit (int, optional): Maximum number of cached queries, defaults
+            to 1000
+        builtin_slots_ttl (float, optional): Duration, in seconds, during
+            which resolved builtin slots values are reused. Defaults to None,
+            meaning that builtin slots are resolved on every query.
+
+    Attributes:
+        hits (int): Number of lookups which found a cached parsing
+        misses (int): Number of lookups which did not find a cached parsing
+    """
+
+    def __init__(self, size_limit=1000, builtin_slots_ttl=None):
+        if size_limit < 1:
+            raise ValueError("size_limit must be >= 1, found %s" % size_limit)
+        self.size_limit = size_limit
+        self.builtin_slots_ttl = builtin_slots_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = LimitedSizeDict(size_limit=size_limit)
+        self._lock = Lock()
+
+    def get(self, text, intents=None):
+        """Returns the :class:`CachedParsing` of *text* and *intents*, or None
+        when it is not cached"""
+        key = _cache_key(text, intents)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            # Re-inserting the entry marks it as the most recently used one
+            self._entries[key] = entry
+            self.hits += 1
+            return entry
+
+    def put(self, text, intents, cached_parsing):
+        """Stores the :class:`CachedParsing` of *text* and *intents*"""
+        key = _cache_key(text, intents)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = cached_parsing
+
+    def clear(self):
+        """Removes all the cached parsings and resets the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _cache_key(text, intents):
+    if intents is None:
+        return text, None
+    return text, tuple(sorted(intents))
@@ -8,50 +8,65 @@ from snips_nlu.result import builtin_slot, custom_slot
 
 
 # pylint:disable=redefined-builtin
-def resolve_slots(input, slots, dataset_entities, language, scope):
-    # Do not use cached entities here as datetimes must be computed using
-    # current context
-    builtin_entities = get_builtin_entities(input, language, scope,
-                                            use_cache=False)
+def resolve_slots(input, slots, dataset_entities, language, scope,
+                  context=None):
+    builtin_entities = get_resolution_builtin_entities(input, language, scope,
+                                                       context)
     resolved_slots = []
     for slot in slots:
-        entity_name = slot[RES_ENTITY]
-        raw_value = slot[RES_VALUE]
-        if is_builtin_entity(entity_name):
-            found = False
-            for ent in builtin_entities:
-                if ent[ENTITY_KIND] == entity_name and \
-                        ent[RES_MATCH_RANGE] == slot[RES_MATCH_RANGE]:
-                    resolved_slot = builtin_slot(slot, ent[ENTITY])
-                    resolved_slots.append(resolved_slot)
-                    found = True
-                    break
-            if not found:
-                builtin_matches = get_builtin_entities(raw_value, language,
-                                                       scope=[entity_name],
-                                                       use_cache=False)
-                if builtin_matches:
-                    resolved_slot = builtin_slot(slot,
-                                                 builtin_matches[0][VALUE])
-                    resolved_slots.append(resolved_slot)
-        else:  # custom slot
-            entity = dataset_entities[entity_name]
-            normalized_raw_value = normalize(raw_value)
-            if raw_value in entity[UTTERANCES]:
-                resolved_value = entity[UTTERANCES][raw_value]
-            elif normalized_raw_value in entity[UTTERANCES]:
-                resolved_value = entity[UTTERANCES][normalized_raw_value]
-            elif entity[AUTOMATICALLY_EXTENSIBLE]:
-                resolved_value = raw_value
-            else:
-                # entity is skipped
-                resolved_value = None
-
-            if resolved_value is not None:
-                resolved_slots.append(custom_slot(slot, resolved_value))
+        resolved_slot = resolve_slot(slot, dataset_entities, language,
+                                     builtin_entities)
+        if resolved_slot is not None:
+            resolved_slots.append(resolved_slot)
     return resolved_slots
 
 
+def get_resolution_builtin_entities(input, language, scope, context=None):
+    # Do not use cached entities here as datetimes must be computed using
+    # current context
+    if context is not None:
+        return context.get_builtin_entities(scope, use_cache=False)
+    return get_builtin_entities(input, language, scope, use_cache=False)
+
+
+def resolve_slot(slot, dataset_entities, language, builtin_entities):
+    """Resolves the value of *slot*, or returns None when the slot cannot be
+    resolved"""
+    if is_builtin_entity(slot[RES_ENTITY]):
+        return _resolve_builtin_slot(slot, language, builtin_entities)
+    return _resolve_custom_slot(slot, dataset_entities)
+
+
+def _resolve_builtin_slot(slot, language, builtin_entities):
+    entity_name = slot[RES_ENTITY]
+    for ent in builtin_entities:
+        if ent[ENTITY_KIND] == entity_name and \
+                ent[RES_MATCH_RANGE] == slot[RES_MATCH_RANGE]:
+            return builtin_slot(slot, ent[ENTITY])
+    builtin_matches = get_builtin_entities(slot[RES_VALUE], language,
+                                           scope=[entity_name],
+                                           use_cache=False)
+    if builtin_matches:
+        return builtin_slot(slot, builtin_matches[0][VALUE])
+    return None
+
+
+def _resolve_custom_slot(slot, dataset_entities):
+    entity = dataset_entities[slot[RES_ENTITY]]
+    raw_value = slot[RES_VALUE]
+    normalized_raw_value = normalize(raw_value)
+    if raw_value in entity[UTTERANCES]:
+        resolved_value = entity[UTTERANCES][raw_value]
+    elif normalized_raw_value in entity[UTTERANCES]:
+        resolved_value = entity[UTTERANCES][normalized_raw_value]
+    elif entity[AUTOMATICALLY_EXTENSIBLE]:
+        resolved_value = raw_value
+    else:
+        # entity is skipped
+        return None
+    return custom_slot(slot, resolved_value)
+
+
 # pylint:enable=redefined-builtin
 
 def get_intent_slot_name_mapping(dataset, intent):
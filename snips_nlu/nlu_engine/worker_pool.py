@@ -0,0 +1,133 @@
+from __future__ import unicode_literals
+
+import gc
+import logging
+from builtins import object, range
+from multiprocessing import Pool, cpu_count
+from uuid import uuid4
+
+from snips_nlu.nlu_engine.nlu_engine import SnipsNLUEngine
+
+logger = logging.getLogger(__name__)
+
+# Engines which are shared with the workers, indexed by pool key. The engines
+# are registered before the workers are forked so that the workers inherit
+# them without having to load them again.
+_ENGINES = dict()
+
+
+class EngineWorkerPool(object):
+    """Pool of worker processes sharing a single loaded
+    :class:`.SnipsNLUEngine`
+
+    The engine is loaded once in the current process, and the workers are then
+    forked from it. On platforms which support ``fork``, the memory pages
+    holding the engine and its resources (word clusters, gazetteers, stems,
+    etc) are thus shared copy-on-write between the workers instead of being
+    duplicated in each of them. Parsing requests are dispatched to the workers
+    through pipes, which allows to use several cores for parsing without being
+    limited by the GIL.
+
+    On platforms where the workers cannot be forked, each worker loads the
+    engine from *engine_path*.
+
+    The pool can be used as a context manager, in which case it is closed
+    when exiting the context:
+
+    .. code-block:: python
+
+        with EngineWorkerPool("path/to/engine", n_workers=4) as pool:
+            pool.parse("Turn on the lights in the kitchen")
+
+    Args:
+        engine_path (str): Path of a persisted :class:`.SnipsNLUEngine`
+        n_workers (int, optional): Number of worker processes, defaults to
+            the number of CPUs
+    """
+
+    def __init__(self, engine_path, n_workers=None):
+        if n_workers is None:
+            n_workers = cpu_count()
+        if n_workers < 1:
+            raise ValueError("n_workers must be >= 1, found %s" % n_workers)
+        self.engine_path = str(engine_path)
+        self.n_workers = n_workers
+        self._key = uuid4().hex
+        _ENGINES[self._key] = SnipsNLUEngine.from_path(self.engine_path)
+        self._pool = _fork_pool(n_workers, self._key, self.engine_path)
+        logger.info("Started %s parsing workers", n_workers)
+
+    def parse(self, text, intents=None):
+        """Performs intent parsing on the provided *text* in one of the
+        workers
+
+        See :meth:`.SnipsNLUEngine.parse`
+        """
+        self._check_not_closed()
+        return self._pool.apply(_parse, (self._key, text, intents))
+
+    def parse_batch(self, texts, intents=None):
+        """Performs intent parsing on a list of *texts*
+
+        The texts are split in chunks which are parsed in parallel by the
+        workers, see :meth:`.SnipsNLUEngine.parse_batch`
+        """
+        self._check_not_closed()
+        if not texts:
+            return []
+        chunk_size = -(-len(texts) // self.n_workers)  # ceil division
+        tasks = [(self._key, texts[i:i + chunk_size], intents)
+                 for i in range(0, len(texts), chunk_size)]
+        results = []
+        for chunk_results in self._pool.map(_parse_batch, tasks):
+            results += chunk_results
+        return results
+
+    def close(self):
+        """Stops the workers and releases the engine"""
+        if self._pool is None:
+            return
+        self._pool.close()
+        self._pool.join()
+        self._pool = None
+        _ENGINES.pop(self._key, None)
+
+    def _check_not_closed(self):
+        if self._pool is None:
+            raise ValueError("EngineWorkerPool is closed")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _fork_pool(n_workers, key, engine_path):
+    # Moving the objects allocated so far to the permanent generation prevents
+    # the garbage collector of the workers from touching them, and thus from
+    # duplicating the memory pages which hold the engine
+    freeze = getattr(gc, "freeze", None)
+    if freeze is not None:
+        gc.collect()
+        freeze()
+    try:
+        return Pool(n_workers, initializer=_init_worker,
+                    initargs=(key, engine_path))
+    finally:
+        if freeze is not None:
+            gc.unfreeze()
+
+
+def _init_worker(key, engine_path):
+    if key not in _ENGINES:
+        _ENGINES[key] = SnipsNLUEngine.from_path(engine_path)
+
+
+def _parse(key, text, intents):
+    return _ENGINES[key].parse(text, intents)
+
+
+def _parse_batch(task):
+    key, texts, intents = task
+    return _ENGINES[key].parse_batch(texts, intents)
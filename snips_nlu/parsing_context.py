@@ -0,0 +1,90 @@
+from __future__ import unicode_literals
+
+from builtins import object
+
+from snips_nlu.builtin_entities import get_builtin_entities
+from snips_nlu.preprocessing import normalize_token, stem_token, tokenize
+from snips_nlu.resources import MissingResource
+
+
+class ParsingContext(object):
+    """Per-query cache of the artifacts derived from an input text
+
+    A :class:`ParsingContext` is created once per query by the
+    :class:`.SnipsNLUEngine` and passed down to the processing units. The
+    tokens, their normalized and stemmed values, as well as the builtin
+    entities are lazily computed and then shared, so that each of them is
+    computed only once per query.
+
+    Attributes:
+        text (str): Input text
+        language (str): Language of the input text
+    """
+
+    def __init__(self, text, language):
+        self.text = text
+        self.language = language
+        self._tokens = None
+        self._normalized_stemmed_tokens = None
+        self._builtin_entities = dict()
+
+    @property
+    def tokens(self):
+        """List of :class:`.Token` of the input text"""
+        if self._tokens is None:
+            self._tokens = tokenize(self.text, self.language)
+        return self._tokens
+
+    @property
+    def tokens_values(self):
+        """List of the tokenized strings of the input text"""
+        return [token.value for token in self.tokens]
+
+    @property
+    def normalized_stemmed_tokens(self):
+        """List of the normalized and stemmed values of the tokens
+
+        When no stems are available for the language, the tokens are only
+        normalized.
+        """
+        if self._normalized_stemmed_tokens is None:
+            try:
+                self._normalized_stemmed_tokens = [
+                    stem_token(token, self.language) for token in self.tokens]
+            except MissingResource:
+                self._normalized_stemmed_tokens = [
+                    normalize_token(token) for token in self.tokens]
+        return self._normalized_stemmed_tokens
+
+    def get_builtin_entities(self, scope=None, use_cache=True):
+        """Builtin entities found in the input text
+
+        The result of the builtin entity parser is memoized for each
+        (*scope*, *use_cache*) pair, see :func:`.get_builtin_entities` for
+        the meaning of the parameters.
+        """
+        scope_key = tuple(sorted(scope)) if scope is not None else None
+        key = (scope_key, use_cache)
+        if key not in self._builtin_entities:
+            self._builtin_entities[key] = get_builtin_entities(
+                self.text, self.language, scope, use_cache)
+        return self._builtin_entities[key]
+
+
+def call_with_context(method, *args, **contexts):
+    """Calls *method* with the parsing context keyword arguments, such as
+    *context* or *contexts*, when it accepts them
+
+    Processing units implemented before the introduction of the
+    :class:`ParsingContext` do not accept these arguments, they are then
+    called with the positional arguments only.
+    """
+    if all(context is None for context in contexts.values()):
+        return method(*args)
+    try:
+        return method(*args, **contexts)
+    except TypeError as e:
+        if not any("unexpected keyword argument '%s'" % name in str(e)
+                   for name in contexts):
+            raise
+    return method(*args)
@@ -18,10 +18,18 @@ class ProbabilisticIntentParserConfig(ProcessingUnitConfig):
         slot_filler_config (:class:`.ProcessingUnitConfig`): The configuration
             that will be used for the underlying slot fillers, by default it
             uses a :class:`.CRFSlotFillerConfig`
+        n_jobs (int, optional): Number of processes used to fit the slot
+            fillers of the different intents in parallel, -1 meaning that all
+            the CPUs are used. Defaults to 1, in which case the slot fillers
+            are fitted sequentially in the current process.
     """
 
     # pylint: disable=super-init-not-called
-    def __init__(self, intent_classifier_config=None, slot_filler_config=None):
+    def __init__(self, intent_classifier_config=None, slot_filler_config=None,
+                 n_jobs=1):
+        if n_jobs == 0 or n_jobs < -1:
+            raise ValueError("n_jobs must be >= 1 or equal to -1, found %s"
+                             % n_jobs)
         if intent_classifier_config is None:
             from snips_nlu.pipeline.configs import LogRegIntentClassifierConfig
             intent_classifier_config = LogRegIntentClassifierConfig()
@@ -32,6 +40,7 @@ class ProbabilisticIntentParserConfig(ProcessingUnitConfig):
             intent_classifier_config)
         self.slot_filler_config = get_processing_unit_config(
             slot_filler_config)
+        self.n_jobs = n_jobs
 
     # pylint: enable=super-init-not-called
 
@@ -47,11 +56,14 @@ class ProbabilisticIntentParserConfig(ProcessingUnitConfig):
         return resources
 
     def to_dict(self):
-        return {
+        config_dict = {
             "unit_name": self.unit_name,
             "slot_filler_config": self.slot_filler_config.to_dict(),
             "intent_classifier_config": self.intent_classifier_config.to_dict()
         }
+        if self.n_jobs != 1:
+            config_dict["n_jobs"] = self.n_jobs
+        return config_dict
 
     @classmethod
     def from_dict(cls, obj_dict):
@@ -69,6 +81,11 @@ class DeterministicIntentParserConfig(ProcessingUnitConfig):
         max_queries (int, optional): Maximum number of regex patterns per
             intent. 50 by default.
         max_pattern_length (int, optional): Maximum length of regex patterns.
+        use_entity_placeholders (bool, optional): If True, the custom entity
+            values are matched in the input by a dictionary lookup over token
+            spans and replaced by placeholders before applying the patterns,
+            instead of being embedded in the patterns. This keeps the patterns
+            small for entities with many values. False by default.
 
 
     This allows to deactivate the usage of regular expression when they are
@@ -80,9 +97,11 @@ class DeterministicIntentParserConfig(ProcessingUnitConfig):
     """
 
     # pylint: disable=super-init-not-called
-    def __init__(self, max_queries=100, max_pattern_length=1000):
+    def __init__(self, max_queries=100, max_pattern_length=1000,
+                 use_entity_placeholders=False):
         self.max_queries = max_queries
         self.max_pattern_length = max_pattern_length
+        self.use_entity_placeholders = use_entity_placeholders
 
     # pylint: enable=super-init-not-called
 
@@ -96,11 +115,14 @@ class DeterministicIntentParserConfig(ProcessingUnitConfig):
         return None
 
     def to_dict(self):
-        return {
+        config_dict = {
             "unit_name": self.unit_name,
             "max_queries": self.max_queries,
             "max_pattern_length": self.max_pattern_length
         }
+        if self.use_entity_placeholders:
+            config_dict["use_entity_placeholders"] = True
+        return config_dict
 
     @classmethod
     def from_dict(cls, obj_dict):
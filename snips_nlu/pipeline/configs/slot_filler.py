@@ -8,6 +8,12 @@ from snips_nlu.pipeline.configs import (
 from snips_nlu.resources import merge_required_resources
 from snips_nlu.utils import classproperty
 
+EXHAUSTIVE_DECODING = "exhaustive"
+VITERBI_DECODING = "viterbi"
+
+CRFSUITE_BACKEND = "crfsuite"
+NUMPY_BACKEND = "numpy"
+
 
 class CRFSlotFillerConfig(ProcessingUnitConfig):
     # pylint: disable=line-too-long
@@ -26,6 +32,19 @@ class CRFSlotFillerConfig(ProcessingUnitConfig):
             corresponding config object for more details.
         random_seed (int, optional): Specify to make the CRF training
             deterministic and reproducible (default=None)
+        builtin_slots_decoding (str, optional): Strategy used to assign the
+            builtin entities found in the input to slots. "exhaustive" scores
+            every possible assignment with the CRF, whereas "viterbi" finds
+            the best one with a constrained Viterbi search over the CRF
+            weights, whose cost does not grow exponentially with the number
+            of builtin entities (default="exhaustive")
+        builtin_slots_beam_width (int, optional): When using the "viterbi"
+            decoding, only keep this number of partial assignments at each
+            builtin entity. The search is exact when None (default=None)
+        inference_backend (str, optional): Backend used to tag the inputs.
+            "crfsuite" relies on the CRFSuite tagger, whereas "numpy" runs a
+            vectorized Viterbi over the CRF weights, which are then persisted
+            along with the model (default="crfsuite")
     """
 
     # pylint: enable=line-too-long
@@ -33,7 +52,10 @@ class CRFSlotFillerConfig(ProcessingUnitConfig):
     # pylint: disable=super-init-not-called
     def __init__(self, feature_factory_configs=None,
                  tagging_scheme=None, crf_args=None,
-                 data_augmentation_config=None, random_seed=None):
+                 data_augmentation_config=None, random_seed=None,
+                 builtin_slots_decoding=EXHAUSTIVE_DECODING,
+                 builtin_slots_beam_width=None,
+                 inference_backend=CRFSUITE_BACKEND):
         if tagging_scheme is None:
             from snips_nlu.slot_filler.crf_utils import TaggingScheme
             tagging_scheme = TaggingScheme.BIO
@@ -50,6 +72,16 @@ class CRFSlotFillerConfig(ProcessingUnitConfig):
         self._data_augmentation_config = None
         self.data_augmentation_config = data_augmentation_config
         self.random_seed = random_seed
+        if builtin_slots_decoding not in (EXHAUSTIVE_DECODING,
+                                          VITERBI_DECODING):
+            raise ValueError("Unknown builtin slots decoding: %s"
+                             % builtin_slots_decoding)
+        self.builtin_slots_decoding = builtin_slots_decoding
+        self.builtin_slots_beam_width = builtin_slots_beam_width
+        if inference_backend not in (CRFSUITE_BACKEND, NUMPY_BACKEND):
+            raise ValueError("Unknown inference backend: %s"
+                             % inference_backend)
+        self.inference_backend = inference_backend
 
     # pylint: enable=super-init-not-called
 
@@ -108,7 +140,10 @@ class CRFSlotFillerConfig(ProcessingUnitConfig):
             "tagging_scheme": self.tagging_scheme.value,
             "data_augmentation_config":
                 self.data_augmentation_config.to_dict(),
-            "random_seed": self.random_seed
+            "random_seed": self.random_seed,
+            "builtin_slots_decoding": self.builtin_slots_decoding,
+            "builtin_slots_beam_width": self.builtin_slots_beam_width,
+            "inference_backend": self.inference_backend
         }
 
     @classmethod
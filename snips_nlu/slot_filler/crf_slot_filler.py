@@ -4,28 +4,32 @@ import base64
 import json
 import logging
 import math
-import shutil
-import tempfile
-from builtins import range
+from builtins import range, zip
+from collections import namedtuple
 from copy import copy
 from itertools import groupby, product
 from pathlib import Path
+from threading import local
 
+import numpy as np
 from future.utils import iteritems
+from pycrfsuite import Tagger
 from sklearn_crfsuite import CRF
 
-from snips_nlu.builtin_entities import get_builtin_entities, is_builtin_entity
+from snips_nlu.builtin_entities import is_builtin_entity
 from snips_nlu.constants import (
     DATA, END, ENTITY_KIND, LANGUAGE, RES_ENTITY, RES_MATCH_RANGE, RES_VALUE,
     START)
 from snips_nlu.data_augmentation import augment_utterances
 from snips_nlu.dataset import validate_and_format_dataset
+from snips_nlu.parsing_context import ParsingContext
 from snips_nlu.pipeline.configs import CRFSlotFillerConfig
-from snips_nlu.preprocessing import tokenize
+from snips_nlu.pipeline.configs.slot_filler import (
+    NUMPY_BACKEND, VITERBI_DECODING)
 from snips_nlu.slot_filler.crf_utils import (
     OUTSIDE, TAGS, TOKENS, positive_tagging, tag_name_to_slot_name,
     tags_to_preslots, tags_to_slots, utterance_to_sample)
-from snips_nlu.slot_filler.feature import TOKEN_NAME
+from snips_nlu.slot_filler.crf_weights import CRFWeights
 from snips_nlu.slot_filler.feature_factory import get_feature_factory
 from snips_nlu.slot_filler.slot_filler import SlotFiller
 from snips_nlu.utils import (
@@ -35,12 +39,29 @@ from snips_nlu.utils import (
 
 logger = logging.getLogger(__name__)
 
+CRF_MODEL_FILENAME = "model.crfsuite"
+CRF_WEIGHTS_FILENAME = "weights.npz"
+
+# Labels of a CRF model along with the tables mapping the decoded labels to
+# the labels encoded for CRFSuite, and conversely
+_LabelsTables = namedtuple(
+    "_LabelsTables",
+    ["crf_model", "labels", "encoding", "decoding", "substitution_label"])
+
+_CRFWeightsData = namedtuple(
+    "_CRFWeightsData",
+    ["crf_model", "crf_weights", "decoded_labels", "decoded_labels_indexes",
+     "features_values_indexes"])
+
 
 class CRFSlotFiller(SlotFiller):
     """Slot filler which uses Linear-Chain Conditional Random Fields underneath
 
     Check https://en.wikipedia.org/wiki/Conditional_random_field to learn
     more about CRFs
+
+    Once fitted, the slot filler can be used concurrently from several
+    threads: each thread relies on its own CRF tagger.
     """
 
     unit_name = "crf_slot_filler"
@@ -60,6 +81,9 @@ class CRFSlotFiller(SlotFiller):
         self.language = None
         self.intent = None
         self.slot_name_mapping = None
+        self._thread_local = local()
+        self._crf_weights = None
+        self._labels_tables = None
 
     @property
     def features(self):
@@ -83,11 +107,82 @@ class CRFSlotFiller(SlotFiller):
         prefix which depends on the :class:`.TaggingScheme` that is used
         (BIO by default).
         """
-        labels = []
-        if self.crf_model.tagger_ is not None:
-            labels = [_decode_tag(label) for label in
-                      self.crf_model.tagger_.labels()]
-        return labels
+        labels_tables = self._get_labels_tables()
+        if labels_tables is None:
+            return []
+        return list(labels_tables.labels)
+
+    def _get_labels_tables(self):
+        if self.crf_model is None:
+            return None
+        if self._labels_tables is None \
+                or self._labels_tables.crf_model is not self.crf_model:
+            self._labels_tables = self._build_labels_tables()
+        return self._labels_tables
+
+    def _build_labels_tables(self):
+        encoded_labels = []
+        tagger = self._tagger
+        if tagger is not None:
+            encoded_labels = tagger.labels()
+        decoding = {label: _decode_tag(label) for label in encoded_labels}
+        labels = [decoding[label] for label in encoded_labels]
+        encoding = {label: encoded for encoded, label in iteritems(decoding)}
+        # Default substitution label used for labels which were not seen
+        # during training
+        substitution_label = None
+        if labels:
+            substitution_label = encoding.get(OUTSIDE, encoded_labels[0])
+        return _LabelsTables(self.crf_model, labels, encoding, decoding,
+                             substitution_label)
+
+    @property
+    def _tagger(self):
+        """CRF tagger bound to the current thread
+
+        The underlying CRFSuite tagger is stateful, hence sharing a single one
+        across threads is not safe. A tagger is thus lazily opened for each
+        thread on the current :attr:`crf_model`.
+        """
+        if self.crf_model is None:
+            return None
+        crf_model = getattr(self._thread_local, "crf_model", None)
+        if crf_model is not self.crf_model:
+            tagger = _open_tagger(self.crf_model)
+            if tagger is None:
+                return None
+            self._thread_local.tagger = tagger
+            self._thread_local.crf_model = self.crf_model
+        return self._thread_local.tagger
+
+    @property
+    def crf_weights(self):
+        """:class:`.CRFWeights` of the current :attr:`crf_model`"""
+        crf_weights_data = self._get_crf_weights_data()
+        if crf_weights_data is None:
+            return None
+        return crf_weights_data.crf_weights
+
+    def _get_crf_weights_data(self):
+        if self.crf_model is None:
+            return None
+        if self._crf_weights is None \
+                or self._crf_weights.crf_model is not self.crf_model:
+            self._set_crf_weights(CRFWeights.from_crf_model(self.crf_model))
+        return self._crf_weights
+
+    def _set_crf_weights(self, crf_weights):
+        # The weights are bound to the crf model they were extracted from,
+        # along with their decoded labels, the index of these labels and the
+        # index of the attributes of each feature
+        decoded_labels = [_decode_tag(l) for l in crf_weights.labels]
+        decoded_labels_indexes = {
+            label: i for i, label in enumerate(decoded_labels)}
+        features_values_indexes = crf_weights.index_features_values(
+            [feature.name for feature in self.features])
+        self._crf_weights = _CRFWeightsData(
+            self.crf_model, crf_weights, decoded_labels,
+            decoded_labels_indexes, features_values_indexes)
 
     @property
     def fitted(self):
@@ -146,6 +241,7 @@ class CRFSlotFiller(SlotFiller):
         # pylint: enable=C0103
         self.crf_model = _get_crf_model(self.config.crf_args)
         self.crf_model.fit(X, Y)
+        self._labels_tables = self._build_labels_tables()
 
         logger.debug(
             "Most relevant features for %s:\n%s", self.intent,
@@ -155,9 +251,12 @@ class CRFSlotFiller(SlotFiller):
     # pylint:enable=arguments-differ
 
     @fitted_required
-    def get_slots(self, text):
+    def get_slots(self, text, context=None):
         """Extracts slots from the provided text
 
+        A :class:`.ParsingContext` may be provided in order to reuse the
+        tokens and builtin entities already computed on *text*
+
         Returns:
             list of dict: The list of extracted slots
 
@@ -168,12 +267,89 @@ class CRFSlotFiller(SlotFiller):
             # Early return if the intent has no slots
             return []
 
-        tokens = tokenize(text, self.language)
+        if context is None:
+            # The context holds the tokens and builtin entities of the text
+            # during this call
+            context = ParsingContext(text, self.language)
+        tokens = context.tokens
         if not tokens:
             return []
-        features = self.compute_features(tokens)
-        tags = [_decode_tag(tag) for tag in
-                self.crf_model.predict_single(features)]
+        features = None
+        state_scores = None
+        if self.config.inference_backend == NUMPY_BACKEND:
+            crf_weights_data = self._get_crf_weights_data()
+            crf_weights = crf_weights_data.crf_weights
+            decoded_labels = crf_weights_data.decoded_labels
+            state_scores = self._compute_state_scores(tokens)
+            best_labels = crf_weights.viterbi(state_scores)
+            tags = [decoded_labels[label] for label in best_labels]
+        else:
+            features = self.compute_features(tokens)
+            decoding = self._get_labels_tables().decoding
+            tags = [decoding[tag] for tag in self._tagger.tag(features)]
+        return self._get_slots_from_tags(text, tokens, tags, features,
+                                         context, state_scores)
+
+    @fitted_required
+    def get_slots_batch(self, texts, contexts=None):
+        """Extracts slots from a list of texts
+
+        The texts are tokenized and featurized in a single pass, and they are
+        tagged together: with the NumPy inference backend, the Viterbi
+        decoding runs on the whole batch at once.
+
+        Args:
+            texts (list of str): Inputs
+            contexts (list of :class:`.ParsingContext`, optional): Parsing
+                contexts of the *texts*
+
+        Returns:
+            list of list of dict: The extracted slots of each text, in the
+            same order as *texts*
+
+        Raises:
+            NotTrained: When the slot filler is not fitted
+        """
+        if not self.slot_name_mapping:
+            # Early return if the intent has no slots
+            return [[] for _ in texts]
+
+        if contexts is None:
+            contexts = [None for _ in texts]
+        contexts = [
+            context if context is not None
+            else ParsingContext(text, self.language)
+            for text, context in zip(texts, contexts)]
+        batch_tokens = [context.tokens for context in contexts]
+        if self.config.inference_backend == NUMPY_BACKEND:
+            crf_weights_data = self._get_crf_weights_data()
+            crf_weights = crf_weights_data.crf_weights
+            decoded_labels = crf_weights_data.decoded_labels
+            batch_features = [None for _ in texts]
+            batch_state_scores = [self._compute_state_scores(tokens)
+                                  for tokens in batch_tokens]
+            batch_best_labels = crf_weights.viterbi_batch(batch_state_scores)
+            batch_tags = [[decoded_labels[label] for label in best_labels]
+                          for best_labels in batch_best_labels]
+        else:
+            tagger = self._tagger
+            decoding = self._get_labels_tables().decoding
+            batch_features = [self.compute_features(tokens)
+                              for tokens in batch_tokens]
+            batch_state_scores = [None for _ in texts]
+            batch_tags = [
+                [decoding[tag] for tag in tagger.tag(features)]
+                if features else [] for features in batch_features]
+        return [
+            self._get_slots_from_tags(text, tokens, tags, features, context,
+                                      state_scores)
+            if tokens else []
+            for text, tokens, tags, features, context, state_scores
+            in zip(texts, batch_tokens, batch_tags, batch_features, contexts,
+                   batch_state_scores)]
+
+    def _get_slots_from_tags(self, text, tokens, tags, features, context,
+                             state_scores=None):
         slots = tags_to_slots(text, tokens, tags, self.config.tagging_scheme,
                               self.slot_name_mapping)
 
@@ -185,7 +361,8 @@ class CRFSlotFiller(SlotFiller):
 
         # Replace tags corresponding to builtin entities by outside tags
         tags = _replace_builtin_tags(tags, builtin_slots_names)
-        return self._augment_slots(text, tokens, tags, builtin_slots_names)
+        return self._augment_slots(text, tokens, tags, builtin_slots_names,
+                                   context, features, state_scores)
 
     def compute_features(self, tokens, drop_out=False):
         """Compute features on the provided tokens
@@ -193,23 +370,78 @@ class CRFSlotFiller(SlotFiller):
         The *drop_out* parameters allows to activate drop out on features that
         have a positive drop out ratio. This should only be used during
         training.
-        """
 
-        cache = [{TOKEN_NAME: token} for token in tokens]
-        features = []
-        random_state = check_random_state(self.config.random_seed)
-        for i in range(len(tokens)):
-            token_features = UnupdatableDict()
-            for feature in self.features:
-                f_drop_out = feature.drop_out
-                if drop_out and random_state.rand() < f_drop_out:
+        The features are computed column-wise: each factory computes its base
+        features once on the whole sequence of tokens, and the values of the
+        offset features are obtained by shifting the base values. The per
+        token dicts expected by CRFSuite are only built at the end.
+        """
+        if not tokens:
+            return []
+        n_tokens = len(tokens)
+        base_features = self._compute_base_features(tokens)
+
+        dropped_out = None
+        if drop_out:
+            random_state = check_random_state(self.config.random_seed)
+            drop_out_ratios = np.array(
+                [feature.drop_out for feature in self.features])
+            dropped_out = random_state.rand(n_tokens, len(self.features)) \
+                          < drop_out_ratios
+
+        features = [UnupdatableDict() for _ in range(n_tokens)]
+        for feature_index, feature in enumerate(self.features):
+            values = base_features[feature.base_name]
+            offset = feature.offset
+            for token_index in range(max(0, -offset),
+                                     min(n_tokens, n_tokens - offset)):
+                value = values[token_index + offset]
+                if value is None:
                     continue
-                value = feature.compute(i, cache)
-                if value is not None:
-                    token_features[feature.name] = value
-            features.append(token_features)
+                if dropped_out is not None \
+                        and dropped_out[token_index, feature_index]:
+                    continue
+                features[token_index][feature.name] = value
         return features
 
+    def _compute_base_features(self, tokens):
+        base_features = dict()
+        for factory in self.features_factories:
+            if factory.offsets:
+                base_features.update(factory.compute_base_features(tokens))
+        return base_features
+
+    def _compute_state_scores(self, tokens):
+        # The attributes of each token are looked up in the CRF weights
+        # directly from the values of the base features, without building
+        # the string attributes expected by CRFSuite
+        crf_weights_data = self._get_crf_weights_data()
+        crf_weights = crf_weights_data.crf_weights
+        if not tokens:
+            return crf_weights.compute_indexed_state_scores(0, [], [], [])
+        n_tokens = len(tokens)
+        base_features = self._compute_base_features(tokens)
+        columns = [
+            (base_features[feature.base_name], feature.offset, values_indexes)
+            for feature, values_indexes in zip(
+                self.features, crf_weights_data.features_values_indexes)]
+        attributes_indexes = []
+        tokens_indexes = []
+        starts = []
+        for token_index in range(n_tokens):
+            start = len(attributes_indexes)
+            for values, offset, values_indexes in columns:
+                index = token_index + offset
+                if 0 <= index < n_tokens:
+                    attribute_index = values_indexes.get(values[index])
+                    if attribute_index is not None:
+                        attributes_indexes.append(attribute_index)
+            if len(attributes_indexes) > start:
+                tokens_indexes.append(token_index)
+                starts.append(start)
+        return crf_weights.compute_indexed_state_scores(
+            n_tokens, attributes_indexes, tokens_indexes, starts)
+
     @fitted_required
     def get_sequence_probability(self, tokens, labels):
         """Gives the joint probability of a sequence of tokens and CRF labels
@@ -231,15 +463,13 @@ class CRFSlotFiller(SlotFiller):
 
     @fitted_required
     def _get_sequence_probability(self, features, labels):
-        # Use a default substitution label when a label was not seen during
-        # training
-        substitution_label = OUTSIDE if OUTSIDE in self.labels else \
-            self.labels[0]
-        cleaned_labels = [
-            _encode_tag(substitution_label if l not in self.labels else l)
-            for l in labels]
-        self.crf_model.tagger_.set(features)
-        return self.crf_model.tagger_.probability(cleaned_labels)
+        labels_tables = self._get_labels_tables()
+        encoding = labels_tables.encoding
+        substitution_label = labels_tables.substitution_label
+        cleaned_labels = [encoding.get(l, substitution_label) for l in labels]
+        tagger = self._tagger
+        tagger.set(features)
+        return tagger.probability(cleaned_labels)
 
     @fitted_required
     def log_weights(self):
@@ -268,12 +498,15 @@ class CRFSlotFiller(SlotFiller):
             log += "\n%s %s: %s" % (feat, _decode_tag(tag), weight)
         return log
 
-    def _augment_slots(self, text, tokens, tags, builtin_slots_names):
+    def _augment_slots(self, text, tokens, tags, builtin_slots_names,
+                       context=None, features=None, state_scores=None):
         scope = set(self.slot_name_mapping[slot]
                     for slot in builtin_slots_names)
+        if context is None:
+            context = ParsingContext(text, self.language)
         builtin_entities = [
-            be for entity_kind in scope for be in get_builtin_entities(
-                text, self.language, [entity_kind], use_cache=True)
+            be for entity_kind in scope
+            for be in context.get_builtin_entities([entity_kind])
         ]
         # We remove builtin entities which conflicts with custom slots
         # extracted by the CRF
@@ -294,33 +527,98 @@ class CRFSlotFiller(SlotFiller):
             grouped_entities,
             key=lambda entities: entities[0][RES_MATCH_RANGE][START])
 
-        features = self.compute_features(tokens)
+        if self.config.inference_backend == NUMPY_BACKEND:
+            if state_scores is None:
+                state_scores = self._compute_state_scores(tokens)
+        elif features is None:
+            features = self.compute_features(tokens)
         spans_ranges = [entities[0][RES_MATCH_RANGE]
                         for entities in grouped_entities]
         tokens_indexes = _spans_to_tokens_indexes(spans_ranges, tokens)
 
+        possible_slots = _get_possible_slots(
+            grouped_entities, self.slot_name_mapping)
+        if self.config.builtin_slots_decoding == VITERBI_DECODING \
+                and _are_disjoint_spans(tokens_indexes):
+            best_updated_tags = self._decode_builtin_slots(
+                features, state_scores, tags, tokens_indexes, possible_slots)
+        else:
+            best_updated_tags = self._search_builtin_slots(
+                features, state_scores, tags, tokens_indexes, possible_slots)
+        slots = tags_to_slots(text, tokens, best_updated_tags,
+                              self.config.tagging_scheme,
+                              self.slot_name_mapping)
+
+        return _reconciliate_builtin_slots(text, slots, builtin_entities)
+
+    def _search_builtin_slots(self, features, state_scores, tags,
+                              tokens_indexes, possible_slots):
         # We loop on all possible slots permutations and use the CRF to find
         # the best one in terms of probability
-        slots_permutations = _get_slots_permutations(
-            grouped_entities, self.slot_name_mapping)
+        if self.config.inference_backend == NUMPY_BACKEND:
+            crf_weights = self.crf_weights
+
+            def get_score(updated_tags):
+                return crf_weights.sequence_score(
+                    state_scores, self._get_labels_indexes(updated_tags))
+        else:
+            def get_score(updated_tags):
+                return self._get_sequence_probability(features, updated_tags)
+
         best_updated_tags = tags
-        best_permutation_score = -1
-        for slots in slots_permutations:
+        best_permutation_score = None
+        for slots in product(*possible_slots):
             updated_tags = copy(tags)
             for slot_index, slot in enumerate(slots):
                 indexes = tokens_indexes[slot_index]
                 sub_tags_sequence = positive_tagging(
                     self.config.tagging_scheme, slot, len(indexes))
                 updated_tags[indexes[0]:indexes[-1] + 1] = sub_tags_sequence
-            score = self._get_sequence_probability(features, updated_tags)
-            if score > best_permutation_score:
+            score = get_score(updated_tags)
+            if best_permutation_score is None \
+                    or score > best_permutation_score:
                 best_updated_tags = updated_tags
                 best_permutation_score = score
-        slots = tags_to_slots(text, tokens, best_updated_tags,
-                              self.config.tagging_scheme,
-                              self.slot_name_mapping)
-
-        return _reconciliate_builtin_slots(text, slots, builtin_entities)
+        return best_updated_tags
+
+    def _decode_builtin_slots(self, features, state_scores, tags,
+                              tokens_indexes, possible_slots):
+        # The sequence is split into segments which are either a builtin
+        # entity span, with one candidate tags sequence per possible slot, or
+        # a run of tokens whose tags are fixed
+        segments = []
+        position = 0
+        for indexes, slots in zip(tokens_indexes, possible_slots):
+            if indexes[0] > position:
+                segments.append([tags[position:indexes[0]]])
+            segments.append([
+                positive_tagging(self.config.tagging_scheme, slot,
+                                 len(indexes)) for slot in slots])
+            position = indexes[-1] + 1
+        if position < len(tags):
+            segments.append([tags[position:]])
+
+        crf_weights = self.crf_weights
+        segments_candidates = [
+            [self._get_labels_indexes(candidate) for candidate in candidates]
+            for candidates in segments]
+        if state_scores is None:
+            state_scores = crf_weights.compute_state_scores(features)
+        best_candidates = crf_weights.decode_segments(
+            state_scores, segments_candidates,
+            self.config.builtin_slots_beam_width)
+        best_updated_tags = []
+        for candidates, candidate_index in zip(segments, best_candidates):
+            best_updated_tags += candidates[candidate_index]
+        return best_updated_tags
+
+    def _get_labels_indexes(self, labels):
+        labels_indexes = self._get_crf_weights_data().decoded_labels_indexes
+        # Use a default substitution label when a label was not seen during
+        # training
+        substitution_index = labels_indexes.get(OUTSIDE, 0)
+        return [labels_indexes.get(label, substitution_index)
+                for label in labels]
 
     @check_persisted_path
     def persist(self, path):
@@ -330,14 +628,21 @@ class CRFSlotFiller(SlotFiller):
 
         crf_model_file = None
         if self.crf_model is not None:
-            destination = path / Path(self.crf_model.modelfile.name).name
-            shutil.copy(self.crf_model.modelfile.name, str(destination))
-            crf_model_file = str(destination.name)
+            crf_model_file = CRF_MODEL_FILENAME
+            with (path / crf_model_file).open(mode="wb") as f:
+                f.write(_get_crf_model_data(self.crf_model))
+
+        crf_weights_file = None
+        if self.crf_model is not None \
+                and self.config.inference_backend == NUMPY_BACKEND:
+            crf_weights_file = CRF_WEIGHTS_FILENAME
+            self.crf_weights.persist(path / crf_weights_file)
 
         model = {
             "language_code": self.language,
             "intent": self.intent,
             "crf_model_file": crf_model_file,
+            "crf_weights_file": crf_weights_file,
             "slot_name_mapping": self.slot_name_mapping,
             "config": self.config.to_dict(),
         }
@@ -372,15 +677,38 @@ class CRFSlotFiller(SlotFiller):
         if crf_model_file is not None:
             crf = _crf_model_from_path(path / crf_model_file)
             slot_filler.crf_model = crf
+            # pylint:disable=protected-access
+            slot_filler._labels_tables = slot_filler._build_labels_tables()
+            # pylint:enable=protected-access
+        crf_weights_file = model.get("crf_weights_file")
+        if crf_weights_file is not None:
+            # pylint:disable=protected-access
+            slot_filler._set_crf_weights(
+                CRFWeights.from_path(path / crf_weights_file))
+            # pylint:enable=protected-access
         return slot_filler
 
-    def __del__(self):
-        if self.crf_model is None or self.crf_model.modelfile.name is None:
-            return
-        try:
-            Path(self.crf_model.modelfile.name).unlink()
-        except OSError:
-            pass
+
+class InMemoryCRF(CRF):
+    """:class:`sklearn_crfsuite.CRF` which is loaded from the bytes of a
+    CRFSuite model instead of a model file
+
+    This avoids writing the model to a temporary file when loading it.
+
+    Args:
+        model_data (bytes): Content of a CRFSuite model file
+    """
+
+    def __init__(self, model_data=None):
+        super(InMemoryCRF, self).__init__()
+        self.model_data = model_data
+
+    @property
+    def tagger_(self):
+        if self._tagger is None and self.model_data is not None:
+            self._tagger = _open_tagger(self)
+            self._info_cached = None
+        return self._tagger
 
 
 def _get_crf_model(crf_args):
@@ -481,14 +809,28 @@ def _disambiguate_builtin_entities(builtin_entities):
 
 
 def _get_slots_permutations(grouped_entities, slot_name_mapping):
+    possible_slots = _get_possible_slots(grouped_entities, slot_name_mapping)
+    return product(*possible_slots)
+
+
+def _get_possible_slots(grouped_entities, slot_name_mapping):
     # We associate to each group of entities the list of slot names that
     # could correspond
-    possible_slots = [
+    return [
         list(set(slot_name for slot_name, ent in iteritems(slot_name_mapping)
                  for entity in entities if ent == entity[ENTITY_KIND]))
         + [OUTSIDE]
         for entities in grouped_entities]
-    return product(*possible_slots)
+
+
+def _are_disjoint_spans(tokens_indexes):
+    position = 0
+    for indexes in tokens_indexes:
+        if not indexes or indexes[0] < position \
+                or indexes != list(range(indexes[0], indexes[-1] + 1)):
+            return False
+        position = indexes[-1] + 1
+    return True
 
 
 def _encode_tag(tag):
@@ -502,12 +844,27 @@ def _decode_tag(tag):
 def _crf_model_from_path(crf_model_path):
     with crf_model_path.open(mode="rb") as f:
         crf_model_data = f.read()
-    with tempfile.NamedTemporaryFile(suffix=".crfsuite", prefix="model",
-                                     delete=False) as f:
-        f.write(crf_model_data)
-        f.flush()
-        crf = CRF(model_filename=f.name)
-    return crf
+    return InMemoryCRF(crf_model_data)
+
+
+def _get_crf_model_data(crf_model):
+    if isinstance(crf_model, InMemoryCRF):
+        return crf_model.model_data
+    with Path(crf_model.modelfile.name).open(mode="rb") as f:
+        return f.read()
+
+
+def _open_tagger(crf_model):
+    tagger = Tagger()
+    if isinstance(crf_model, InMemoryCRF):
+        # The tagger reads the model directly from the provided buffer, which
+        # is kept alive by the crf model
+        tagger.open_inmemory(crf_model.model_data)
+    elif crf_model.modelfile.name is not None:
+        tagger.open(crf_model.modelfile.name)
+    else:
+        return None
+    return tagger
 
 # pylint: disable=invalid-name
 def _ensure_safe(X, Y):
@@ -0,0 +1,296 @@
+from __future__ import unicode_literals
+
+from builtins import object, range, str, zip
+from pathlib import Path
+
+import numpy as np
+from future.utils import iteritems
+
+
+class CRFWeights(object):
+    """Weights of a linear-chain CRF stored as NumPy arrays
+
+    This allows to score and decode sequences of labels without going
+    through the CRFSuite tagger, for instance in order to decode under
+    constraints or to tag with vectorized NumPy operations.
+
+    Args:
+        labels (list of str): Labels of the CRF, as used by CRFSuite
+        attributes (list of str): CRFSuite attributes having a weight, such
+            as "ngram_1:foo"
+        state_weights (:class:`numpy.ndarray`): Weights of the attributes for
+            each label, with shape (n_attributes, n_labels)
+        transition_weights (:class:`numpy.ndarray`): Weights of the
+            transitions between labels, with shape (n_labels, n_labels), the
+            rows corresponding to the previous label
+    """
+
+    def __init__(self, labels, attributes, state_weights,
+                 transition_weights):
+        self.labels = list(labels)
+        self.attributes = list(attributes)
+        self.state_weights = state_weights
+        self.transition_weights = transition_weights
+        self.labels_indexes = {label: i for i, label in enumerate(labels)}
+        self.attributes_indexes = {
+            attribute: i for i, attribute in enumerate(attributes)}
+        # Transitions indexed by (label, previous label), which makes the
+        # reductions of the Viterbi recursion contiguous
+        self._transposed_transitions = np.ascontiguousarray(
+            transition_weights.T)
+
+    @classmethod
+    def from_crf_model(cls, crf_model):
+        """Extracts the weights of a fitted :class:`sklearn_crfsuite.CRF`"""
+        labels = [str(label) for label in crf_model.classes_]
+        labels_indexes = {label: i for i, label in enumerate(labels)}
+        state_features = crf_model.state_features_
+        attributes = sorted(set(attr for attr, _ in state_features))
+        attributes_indexes = {attr: i for i, attr in enumerate(attributes)}
+        state_weights = np.zeros((len(attributes), len(labels)))
+        for (attr, label), weight in iteritems(state_features):
+            state_weights[attributes_indexes[attr],
+                          labels_indexes[str(label)]] = weight
+        transition_weights = np.zeros((len(labels), len(labels)))
+        for (label_from, label_to), weight in iteritems(
+                crf_model.transition_features_):
+            transition_weights[labels_indexes[str(label_from)],
+                               labels_indexes[str(label_to)]] = weight
+        return cls(labels, attributes, state_weights, transition_weights)
+
+    def persist(self, path):
+        """Saves the weights in a NumPy .npz file at the given path"""
+        with Path(path).open(mode="wb") as f:
+            np.savez(f, labels=np.array(self.labels),
+                     attributes=np.array(self.attributes),
+                     state_weights=self.state_weights,
+                     transition_weights=self.transition_weights)
+
+    @classmethod
+    def from_path(cls, path):
+        """Loads weights saved with :meth:`persist`"""
+        with Path(path).open(mode="rb") as f:
+            arrays = np.load(f, allow_pickle=False)
+            return cls(labels=[str(l) for l in arrays["labels"]],
+                       attributes=[str(a) for a in arrays["attributes"]],
+                       state_weights=arrays["state_weights"],
+                       transition_weights=arrays["transition_weights"])
+
+    def compute_state_scores(self, features):
+        """Computes the state scores of a sequence of features
+
+        Args:
+            features (list of dict): Features of each token, as passed to
+                the CRFSuite tagger
+
+        Returns:
+            :class:`numpy.ndarray`: State score of each label for each token,
+            with shape (n_tokens, n_labels)
+        """
+        # String features are turned into "name:value" attributes by CRFSuite,
+        # and attributes unseen during training are ignored
+        tokens_indexes = []
+        rows = []
+        for token_index, token_features in enumerate(features):
+            for name, value in iteritems(token_features):
+                row = self.attributes_indexes.get("%s:%s" % (name, value))
+                if row is not None:
+                    tokens_indexes.append(token_index)
+                    rows.append(row)
+        scores = np.zeros((len(features), len(self.labels)))
+        np.add.at(scores, tokens_indexes, self.state_weights[rows])
+        return scores
+
+    def index_features_values(self, features_names):
+        """Indexes the attributes of some features by their values
+
+        This allows to look up the attributes of a sequence directly from
+        the values of its features, see :meth:`compute_indexed_state_scores`.
+
+        Args:
+            features_names (list of str): Names of the features, as passed to
+                the CRFSuite tagger
+
+        Returns:
+            list of dict: For each feature, the index of its attributes keyed
+            by the corresponding feature value
+        """
+        features_indexes = {name: i for i, name in enumerate(features_names)}
+        values_indexes = [dict() for _ in features_names]
+        for attribute_index, attribute in enumerate(self.attributes):
+            # Feature values may contain the separator, hence the attribute
+            # is split at the first separator preceded by a feature name
+            separator_index = attribute.find(":")
+            while separator_index >= 0:
+                feature_index = features_indexes.get(
+                    attribute[:separator_index])
+                if feature_index is not None:
+                    value = attribute[separator_index + 1:]
+                    values_indexes[feature_index][value] = attribute_index
+                    break
+                separator_index = attribute.find(":", separator_index + 1)
+        return values_indexes
+
+    def compute_indexed_state_scores(self, n_tokens, attributes_indexes,
+                                     tokens_indexes, starts):
+        """Computes the state scores of a sequence from the indexes of its
+        attributes
+
+        Args:
+            n_tokens (int): Length of the sequence
+            attributes_indexes (list of int): Indexes of the attributes of
+                the sequence, grouped by token
+            tokens_indexes (list of int): Tokens having at least one
+                attribute, in increasing order
+            starts (list of int): Position, in *attributes_indexes*, of the
+                first attribute of each token of *tokens_indexes*
+
+        Returns:
+            :class:`numpy.ndarray`: State score of each label for each token,
+            with shape (n_tokens, n_labels)
+        """
+        scores = np.zeros((n_tokens, len(self.labels)))
+        if attributes_indexes:
+            scores[tokens_indexes] = np.add.reduceat(
+                self.state_weights[attributes_indexes], starts, axis=0)
+        return scores
+
+    def sequence_score(self, state_scores, labels_indexes):
+        """Computes the unnormalized score of a sequence of labels
+
+        The score is the logarithm of the probability of the sequence, up to
+        a constant which only depends on the input.
+        """
+        score = state_scores[np.arange(len(labels_indexes)),
+                             labels_indexes].sum()
+        score += sum(self.transition_weights[label_from, label_to]
+                     for label_from, label_to in zip(labels_indexes,
+                                                     labels_indexes[1:]))
+        return score
+
+    def viterbi(self, state_scores):
+        """Finds the sequence of labels having the highest score
+
+        Args:
+            state_scores (:class:`numpy.ndarray`): State scores of the
+                sequence, see :meth:`compute_state_scores`
+
+        Returns:
+            list of int: Index of the best label of each token
+        """
+        if not len(state_scores):
+            return []
+        labels_range = np.arange(len(self.labels))
+        backpointers = []
+        scores = state_scores[0]
+        for token_scores in state_scores[1:]:
+            # Scores of all the (label, previous label) pairs
+            candidates = self._transposed_transitions + scores
+            best_previous_labels = candidates.argmax(axis=1)
+            backpointers.append(best_previous_labels)
+            scores = candidates[labels_range, best_previous_labels]
+            scores += token_scores
+        best_label = scores.argmax()
+        best_labels = [int(best_label)]
+        for best_previous_labels in reversed(backpointers):
+            best_label = best_previous_labels[best_label]
+            best_labels.append(int(best_label))
+        return best_labels[::-1]
+
+    def viterbi_batch(self, batch_state_scores):
+        """Finds the best sequences of labels of a batch of sequences
+
+        The sequences are padded to the same length so that the Viterbi
+        recursion runs on the whole batch at once.
+
+        Args:
+            batch_state_scores (list of :class:`numpy.ndarray`): State scores
+                of each sequence, see :meth:`compute_state_scores`
+
+        Returns:
+            list of list of int: Index of the best label of each token, for
+            each sequence of the batch
+        """
+        lengths = np.array([scores.shape[0] for scores in batch_state_scores],
+                           dtype=int)
+        max_length = lengths.max() if len(lengths) else 0
+        if max_length == 0:
+            return [[] for _ in batch_state_scores]
+        n_labels = len(self.labels)
+        padded_scores = np.zeros((len(lengths), max_length, n_labels))
+        for i, state_scores in enumerate(batch_state_scores):
+            padded_scores[i, :lengths[i]] = state_scores
+        backpointers = np.zeros((len(lengths), max_length, n_labels),
+                                dtype=int)
+        scores = padded_scores[:, 0]
+        for token_index in range(1, max_length):
+            # Scores of all the (previous label, label) pairs
+            candidates = scores[:, :, np.newaxis] + self.transition_weights
+            backpointers[:, token_index] = candidates.argmax(axis=1)
+            new_scores = candidates.max(axis=1) + padded_scores[:, token_index]
+            # The scores of the sequences which are already over are frozen
+            is_running = (token_index < lengths)[:, np.newaxis]
+            scores = np.where(is_running, new_scores, scores)
+
+        batch_best_labels = []
+        for i, length in enumerate(lengths):
+            if length == 0:
+                batch_best_labels.append([])
+                continue
+            best_labels = [int(scores[i].argmax())]
+            for token_index in range(length - 1, 0, -1):
+                best_labels.append(
+                    int(backpointers[i, token_index, best_labels[-1]]))
+            batch_best_labels.append(best_labels[::-1])
+        return batch_best_labels
+
+    def decode_segments(self, state_scores, segments_candidates,
+                        beam_width=None):
+        """Finds the best sequence of labels made of one candidate per segment
+
+        The sequence is split into consecutive segments, each of them having
+        a list of candidate sequences of labels. The best combination of
+        candidates is found with a Viterbi search over the segments, whose
+        cost grows linearly with the number of segments instead of
+        exponentially.
+
+        Args:
+            state_scores (:class:`numpy.ndarray`): State scores of the
+                sequence, see :meth:`compute_state_scores`
+            segments_candidates (list of list of list of int): Candidates of
+                each segment, expressed as sequences of label indexes
+            beam_width (int, optional): When provided, only the
+                *beam_width* best partial sequences are kept after each
+                segment, which makes the search approximate
+
+        Returns:
+            list of int: Index of the best candidate in each segment
+        """
+        # Each hypothesis is a tuple (score, candidates indexes, last label)
+        hypotheses = [(0.0, [], None)]
+        position = 0
+        for candidates in segments_candidates:
+            segment_length = len(candidates[0])
+            positions = list(range(position, position + segment_length))
+            position += segment_length
+            new_hypotheses = []
+            for candidate_index, candidate in enumerate(candidates):
+                segment_score = self.sequence_score(
+                    state_scores[positions], candidate)
+                best = None
+                for score, indexes, last_label in hypotheses:
+                    if last_label is not None:
+                        score += self.transition_weights[
+                            last_label, candidate[0]]
+                    if best is None or score > best[0]:
+                        best = (score, indexes, last_label)
+                new_hypotheses.append(
+                    (best[0] + segment_score, best[1] + [candidate_index],
+                     candidate[-1]))
+            if beam_width is not None and len(new_hypotheses) > beam_width:
+                new_hypotheses = sorted(
+                    new_hypotheses, key=lambda h: h[0],
+                    reverse=True)[:beam_width]
+            hypotheses = new_hypotheses
+        best_score = max(h[0] for h in hypotheses)
+        return next(h[1] for h in hypotheses if h[0] == best_score)
@@ -1,15 +1,14 @@
 from __future__ import unicode_literals
 
 from abc import ABCMeta, abstractmethod
-from builtins import map, object, str
+from builtins import object, range, str
 
 from future.utils import iteritems, with_metaclass
 from snips_nlu_ontology.builtin_entities import get_supported_entities
 from snips_nlu_utils import get_shape, normalize
 
 from snips_nlu.builtin_entities import get_builtin_entities
-from snips_nlu.constants import (END, GAZETTEERS, LANGUAGE, NGRAM,
-                                 RES_MATCH_RANGE, START, STEMS, TOKEN_INDEXES,
+from snips_nlu.constants import (ENTITY_KIND, GAZETTEERS, LANGUAGE, STEMS,
                                  UTTERANCES, WORD_CLUSTERS)
 from snips_nlu.languages import get_default_sep
 from snips_nlu.preprocessing import stem, stem_token, normalize_token
@@ -17,7 +16,6 @@ from snips_nlu.resources import get_gazetteer, get_word_clusters
 from snips_nlu.slot_filler.crf_utils import TaggingScheme, get_scheme_prefix
 from snips_nlu.slot_filler.feature import Feature
 from snips_nlu.slot_filler.features_utils import (entity_filter,
-                                                  get_all_ngrams,
                                                   get_intent_custom_entities,
                                                   get_word_chunk,
                                                   initial_string_from_tokens)
@@ -67,6 +65,25 @@ class CRFFeatureFactory(with_metaclass(ABCMeta, object)):
         """Build a list of :class:`.Feature`"""
         pass
 
+    def compute_base_features(self, tokens):
+        """Compute the features of the factory on a whole sequence of tokens
+
+        The features are computed without their offset, the values of the
+        offset features being obtained afterwards by shifting these base
+        values. Factories can override this method in order to share some
+        computations across tokens and features.
+
+        Returns:
+            dict: Mapping from the base name of each feature to the list of
+            its values on the tokens, None meaning that the feature is absent
+        """
+        base_features = dict()
+        for feature in self.build_features():
+            if feature.base_name not in base_features:
+                base_features[feature.base_name] = [
+                    feature.function(tokens, i) for i in range(len(tokens))]
+        return base_features
+
     def get_required_resources(self):
         return None
 
@@ -92,6 +109,12 @@ class SingleFeatureFactory(with_metaclass(ABCMeta, CRFFeatureFactory)):
                 drop_out=self.drop_out) for offset in self.offsets
         ]
 
+    def compute_base_features(self, tokens):
+        return {
+            self.feature_name: [self.compute_feature(tokens, i)
+                                for i in range(len(tokens))]
+        }
+
 
 class IsDigitFactory(SingleFeatureFactory):
     """Feature: is the considered token a digit?"""
@@ -246,6 +269,19 @@ class NgramFactory(SingleFeatureFactory):
             return get_default_sep(self.language).join(words)
         return None
 
+    def compute_base_features(self, tokens):
+        # Each token is normalized, or stemmed, only once for all the n-grams
+        if self.use_stemming:
+            words = [stem_token(t, self.language) for t in tokens]
+        else:
+            words = [normalize_token(t) for t in tokens]
+        if self.gazetteer is not None:
+            words = [w if w in self.gazetteer else "rare_word" for w in words]
+        return {
+            self.feature_name: _get_ngrams_values(
+                words, self.n, get_default_sep(self.language))
+        }
+
     def get_required_resources(self):
         resources = dict()
         if self.common_words_gazetteer_name is not None:
@@ -305,6 +341,13 @@ class ShapeNgramFactory(SingleFeatureFactory):
                 get_shape(t.value) for t in tokens[token_index:end])
         return None
 
+    def compute_base_features(self, tokens):
+        shapes = [get_shape(t.value) for t in tokens]
+        return {
+            self.feature_name: _get_ngrams_values(
+                shapes, self.n, get_default_sep(self.language))
+        }
+
 
 class WordClusterFactory(SingleFeatureFactory):
     """Feature: The cluster which the considered token belongs to, if any
@@ -385,6 +428,9 @@ class EntityMatchFactory(CRFFeatureFactory):
         self.use_stemming = self.args["use_stemming"]
         self.tagging_scheme = TaggingScheme(
             self.args["tagging_scheme_code"])
+        self._collections = None
+        self._entities_per_value = None
+        self._values_prefixes = None
         self.collections = self.args.get("collections")
         self._language = None
         self.language = self.args.get("language_code")
@@ -399,6 +445,29 @@ class EntityMatchFactory(CRFFeatureFactory):
             self._language = value
             self.args["language_code"] = self.language
 
+    @property
+    def collections(self):
+        return self._collections
+
+    @collections.setter
+    def collections(self, value):
+        self._collections = value
+        # The entity values are indexed, along with all their prefixes which
+        # end on a token boundary, in order to match all the entities at once
+        self._entities_per_value = dict()
+        self._values_prefixes = set()
+        if value is None:
+            return
+        for name, collection in sorted(iteritems(value)):
+            for entity_value in collection:
+                entities = self._entities_per_value.setdefault(
+                    entity_value, [])
+                if name not in entities:
+                    entities.append(name)
+                for index, char in enumerate(entity_value):
+                    if char == " ":
+                        self._values_prefixes.add(entity_value[:index])
+
     def fit(self, dataset, intent):
         self.language = dataset[LANGUAGE]
 
@@ -409,12 +478,13 @@ class EntityMatchFactory(CRFFeatureFactory):
             return normalized
 
         intent_entities = get_intent_custom_entities(dataset, intent)
-        self.collections = dict()
+        collections = dict()
         for entity_name, entity in iteritems(intent_entities):
             if not entity[UTTERANCES]:
                 continue
             collection = list(preprocess(e) for e in entity[UTTERANCES])
-            self.collections[entity_name] = collection
+            collections[entity_name] = collection
+        self.collections = collections
         self.args["collections"] = self.collections
         return self
 
@@ -425,10 +495,10 @@ class EntityMatchFactory(CRFFeatureFactory):
 
     def build_features(self):
         features = []
-        for name, collection in iteritems(self.collections):
+        for name in self.collections:
             # We need to call this wrapper in order to properly capture
-            # `collection`
-            collection_match = self._build_collection_match_fn(collection)
+            # `name`
+            collection_match = self._build_collection_match_fn(name)
 
             for offset in self.offsets:
                 feature = Feature("entity_match_%s" % name,
@@ -436,25 +506,51 @@ class EntityMatchFactory(CRFFeatureFactory):
                 features.append(feature)
         return features
 
-    def _build_collection_match_fn(self, collection):
-        collection_set = set(collection)
+    def _build_collection_match_fn(self, entity_name):
+        feature_name = "entity_match_%s" % entity_name
 
         def collection_match(tokens, token_index):
-            normalized_tokens = list(map(self._transform, tokens))
-            ngrams = get_all_ngrams(normalized_tokens)
-            ngrams = [ngram for ngram in ngrams if
-                      token_index in ngram[TOKEN_INDEXES]]
-            ngrams = sorted(ngrams, key=lambda ng: len(ng[TOKEN_INDEXES]),
-                            reverse=True)
-            for ngram in ngrams:
-                if ngram[NGRAM] in collection_set:
-                    return get_scheme_prefix(token_index,
-                                             sorted(ngram[TOKEN_INDEXES]),
-                                             self.tagging_scheme)
-            return None
+            return self.compute_base_features(tokens)[feature_name][
+                token_index]
 
         return collection_match
 
+    def compute_base_features(self, tokens):
+        # The tokens are normalized once, and all the entity values are then
+        # matched in a single scan over the utterance. From each start token,
+        # the n-gram is extended as long as it is a prefix of some entity
+        # value.
+        normalized_tokens = [self._transform(t) for t in tokens]
+        matches = []
+        for start in range(len(tokens)):
+            ngram = None
+            for end in range(start + 1, len(tokens) + 1):
+                token = normalized_tokens[end - 1]
+                ngram = token if ngram is None else ngram + " " + token
+                entities = self._entities_per_value.get(ngram)
+                if entities is not None:
+                    matches.append((start, end, entities))
+                if ngram not in self._values_prefixes:
+                    break
+
+        # Each token is tagged with the longest matching n-gram, and then
+        # with the leftmost one
+        matches = sorted(matches, key=lambda m: (m[0] - m[1], m[0]))
+        values_per_entity = {
+            name: [None] * len(tokens) for name in self.collections}
+        for start, end, entities in matches:
+            indexes = list(range(start, end))
+            for entity in entities:
+                values = values_per_entity[entity]
+                for index in indexes:
+                    if values[index] is None:
+                        values[index] = get_scheme_prefix(
+                            index, indexes, self.tagging_scheme)
+        return {
+            "entity_match_%s" % name: values
+            for name, values in iteritems(values_per_entity)
+        }
+
     def get_required_resources(self):
         if self.use_stemming:
             return {STEMS: True}
@@ -471,6 +567,13 @@ class BuiltinEntityMatchFactory(CRFFeatureFactory):
     It has one parameter, *tagging_scheme_code*, which represents a
     :class:`.TaggingScheme`. This allows to give more information about the
     match.
+
+    The builtin entity parser is run once per utterance over the full scope
+    of builtin entities, and the parsed entities are grouped by kind. As the
+    parser resolves overlapping matches against each other, an entity nested
+    in a larger entity of another kind (e.g. a number inside a datetime) is
+    not matched. The grouped entities of the last utterance are memoized, so
+    that the features of all the kinds, offsets and tokens share them.
     """
 
     name = "builtin_entity_match"
@@ -483,6 +586,7 @@ class BuiltinEntityMatchFactory(CRFFeatureFactory):
         self.builtin_entities = self.args.get("entity_labels")
         self._language = None
         self.language = self.args.get("language_code")
+        self._entities_cache = (None, dict())
 
     @property
     def language(self):
@@ -517,27 +621,58 @@ class BuiltinEntityMatchFactory(CRFFeatureFactory):
     def _build_entity_match_fn(self, builtin_entity):
 
         def builtin_entity_match(tokens, token_index):
-            text = initial_string_from_tokens(tokens)
             start = tokens[token_index].start
             end = tokens[token_index].end
 
-            builtin_entities = get_builtin_entities(
-                text, self.language, scope=[builtin_entity], use_cache=True)
-            builtin_entities = [ent for ent in builtin_entities
-                                if entity_filter(ent, start, end)]
+            builtin_entities = [
+                ent for ent in self._get_builtin_entities(tokens,
+                                                          builtin_entity)
+                if entity_filter(ent, start, end)]
             for ent in builtin_entities:
-                entity_start = ent[RES_MATCH_RANGE][START]
-                entity_end = ent[RES_MATCH_RANGE][END]
-                indexes = []
-                for index, token in enumerate(tokens):
-                    if (entity_start <= token.start < entity_end) \
-                            and (entity_start < token.end <= entity_end):
-                        indexes.append(index)
+                indexes = _get_entity_tokens_indexes(ent, tokens)
                 return get_scheme_prefix(token_index, indexes,
                                          self.tagging_scheme)
 
         return builtin_entity_match
 
+    def compute_base_features(self, tokens):
+        base_features = dict()
+        for builtin_entity in self.builtin_entities:
+            values = [None] * len(tokens)
+            for ent in self._get_builtin_entities(tokens, builtin_entity):
+                indexes = _get_entity_tokens_indexes(ent, tokens)
+                for index in indexes:
+                    # The first matching entity takes precedence
+                    if values[index] is None:
+                        values[index] = get_scheme_prefix(
+                            index, indexes, self.tagging_scheme)
+            feature_name = "builtin_entity_match_%s" % builtin_entity
+            base_features[feature_name] = values
+        return base_features
+
+    def _get_builtin_entities(self, tokens, builtin_entity):
+        text = initial_string_from_tokens(tokens)
+        # The memo is replaced as a whole when the utterance changes, so that
+        # it can safely be shared between threads
+        cached_text, entities_per_kind = self._entities_cache
+        if cached_text != text:
+            entities_per_kind = dict()
+            for ent in get_builtin_entities(text, self.language,
+                                            use_cache=True):
+                entities_per_kind.setdefault(ent[ENTITY_KIND], []).append(ent)
+            self._entities_cache = (text, entities_per_kind)
+        return entities_per_kind.get(builtin_entity, [])
+
+
+def _get_entity_tokens_indexes(entity, tokens):
+    return [index for index, token in enumerate(tokens)
+            if entity_filter(entity, token.start, token.end)]
+
+
+def _get_ngrams_values(words, n, sep):
+    values = [sep.join(words[i:i + n]) for i in range(len(words) - n + 1)]
+    return values + [None] * (len(words) - len(values))
+
 
 FACTORIES = [IsDigitFactory, IsFirstFactory, IsLastFactory, PrefixFactory,
              SuffixFactory, LengthFactory, NgramFactory, ShapeNgramFactory,
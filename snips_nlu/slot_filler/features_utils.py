@@ -1,5 +1,7 @@
 from __future__ import unicode_literals
 
+from threading import Lock
+
 from snips_nlu_utils import compute_all_ngrams
 
 from snips_nlu.builtin_entities import is_builtin_entity
@@ -8,16 +10,20 @@ from snips_nlu.constants import (DATA, END, ENTITIES, ENTITY, INTENTS,
 from snips_nlu.utils import LimitedSizeDict
 
 _NGRAMS_CACHE = LimitedSizeDict(size_limit=1000)
+_NGRAMS_CACHE_LOCK = Lock()
 
 
 def get_all_ngrams(tokens):
     if not tokens:
         return []
     key = "<||>".join(tokens)
-    if key not in _NGRAMS_CACHE:
+    with _NGRAMS_CACHE_LOCK:
+        ngrams = _NGRAMS_CACHE.get(key)
+    if ngrams is None:
         ngrams = compute_all_ngrams(tokens, len(tokens))
-        _NGRAMS_CACHE[key] = ngrams
-    return _NGRAMS_CACHE[key]
+        with _NGRAMS_CACHE_LOCK:
+            _NGRAMS_CACHE[key] = ngrams
+    return ngrams
 
 
 def get_word_chunk(word, chunk_size, chunk_start, reverse=False):
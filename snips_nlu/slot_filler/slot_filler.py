@@ -1,7 +1,9 @@
 from abc import ABCMeta, abstractmethod
+from builtins import zip
 
 from future.utils import with_metaclass
 
+from snips_nlu.parsing_context import call_with_context
 from snips_nlu.pipeline.processing_unit import ProcessingUnit
 
 
@@ -18,11 +20,29 @@ class SlotFiller(with_metaclass(ABCMeta, ProcessingUnit)):
         pass
 
     @abstractmethod
-    def get_slots(self, text):
+    def get_slots(self, text, context=None):
         """Performs slot extraction (slot filling) on the provided *text*
 
+        A :class:`.ParsingContext` may be provided in order to reuse the
+        artifacts already computed on *text*
+
         Returns:
             list of dict: The list of extracted slots. See
                 :func:`.unresolved_slot` for the output format of a slot
         """
         pass
+
+    def get_slots_batch(self, texts, contexts=None):
+        """Performs slot extraction on a list of *texts*
+
+        The default implementation calls :meth:`get_slots` on each text, slot
+        fillers may override it to process the whole batch at once.
+
+        Returns:
+            list of list of dict: The extracted slots of each text, in the
+            same order as *texts*
+        """
+        if contexts is None:
+            return [self.get_slots(text) for text in texts]
+        return [call_with_context(self.get_slots, text, context=context)
+                for text, context in zip(texts, contexts)]
@@ -3,14 +3,20 @@ from __future__ import unicode_literals
 
 import shutil
 import tempfile
+from threading import Thread
+
+import requests
+from mock import MagicMock
 
 from snips_nlu import SnipsNLUEngine
 from snips_nlu.cli import cross_val_metrics, parse, train, train_test_metrics
+from snips_nlu.cli.serve import make_server
 from snips_nlu.cli.dataset import AssistantDataset
 from snips_nlu.cli.dataset.entities import CustomEntity
 from snips_nlu.cli.dataset.intent_dataset import IntentDataset
 from snips_nlu.constants import PACKAGE_PATH
 from snips_nlu.dataset import validate_and_format_dataset
+from snips_nlu.nlu_engine import EngineWorkerPool
 from snips_nlu.tests.utils import BEVERAGE_DATASET_PATH, SnipsTest, TEST_PATH
 
 
@@ -56,6 +62,53 @@ class TestCLI(SnipsTest):
         with self.fail_if_exception("Failed to parse using CLI script"):
             parse(str(self.tmp_file_path), "Make me two cups of coffee")
 
+    def test_serve(self):
+        # Given
+        train(BEVERAGE_DATASET_PATH, str(self.tmp_file_path), config_path=None)
+        engine = SnipsNLUEngine.from_path(self.tmp_file_path)
+        text = "Make me two cups of coffee"
+
+        with EngineWorkerPool(self.tmp_file_path, n_workers=1) as pool:
+            server = make_server(pool, "localhost", 0)
+            port = server.server_address[1]
+            server_thread = Thread(target=server.serve_forever)
+            server_thread.start()
+
+            # When
+            try:
+                response = requests.post(
+                    "http://localhost:%s/parse" % port, json={"input": text})
+            finally:
+                server.shutdown()
+                server.server_close()
+                server_thread.join()
+
+        # Then
+        self.assertEqual(200, response.status_code)
+        self.assertDictEqual(engine.parse(text), response.json())
+
+    def test_serve_should_return_server_error(self):
+        # Given
+        pool = MagicMock()
+        pool.parse.side_effect = RuntimeError("Broken worker pool")
+        server = make_server(pool, "localhost", 0)
+        port = server.server_address[1]
+        server_thread = Thread(target=server.serve_forever)
+        server_thread.start()
+
+        # When
+        try:
+            response = requests.post(
+                "http://localhost:%s/parse" % port, json={"input": "foo"})
+        finally:
+            server.shutdown()
+            server.server_close()
+            server_thread.join()
+
+        # Then
+        self.assertEqual(500, response.status_code)
+        self.assertDictEqual({"error": "Broken worker pool"}, response.json())
+
     def test_cross_val_metrics(self):
         # Given / When
         cross_val_metrics(str(BEVERAGE_DATASET_PATH), str(self.tmp_file_path))
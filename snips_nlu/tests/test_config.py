@@ -112,7 +112,10 @@ class TestConfig(SnipsTest):
             },
             "data_augmentation_config":
                 SlotFillerDataAugmentationConfig().to_dict(),
-            "random_seed": 43
+            "random_seed": 43,
+            "builtin_slots_decoding": "viterbi",
+            "builtin_slots_beam_width": 10,
+            "inference_backend": "numpy"
         }
 
         # When
@@ -1,11 +1,14 @@
 # coding=utf-8
 from __future__ import unicode_literals
 
+from builtins import range
 from copy import deepcopy
 
 from mock import MagicMock, patch
 
-from snips_nlu.constants import LANGUAGE_EN, SNIPS_DATETIME, SNIPS_NUMBER
+from snips_nlu.constants import (
+    END, ENTITY_KIND, LANGUAGE_EN, RES_MATCH_RANGE, RES_VALUE, SNIPS_DATETIME,
+    SNIPS_NUMBER, START)
 from snips_nlu.dataset import validate_and_format_dataset
 from snips_nlu.preprocessing import tokenize
 from snips_nlu.slot_filler.crf_utils import (
@@ -107,6 +110,31 @@ class TestCRFFeatures(SnipsTest):
         self.assertEqual(res_0, "hello_5")
         self.assertEqual(res_1, "beautiful_9")
 
+    def test_single_feature_factory_should_compute_base_features(self):
+        # Given
+        class TestSingleFeatureFactory(SingleFeatureFactory):
+            def compute_feature(self, tokens, token_index):
+                value = tokens[token_index].value
+                return "%s_%s" % (value, len(value))
+
+        config = {
+            "factory_name": "test_factory",
+            "args": {},
+            "offsets": [-1, 0, 1]
+        }
+        factory = TestSingleFeatureFactory(config)
+        factory.fit(None, None)
+        tokens = tokenize("hello beautiful world", LANGUAGE_EN)
+
+        # When
+        base_features = factory.compute_base_features(tokens)
+
+        # Then
+        expected_base_features = {
+            "test_factory": ["hello_5", "beautiful_9", "world_5"]
+        }
+        self.assertDictEqual(expected_base_features, base_features)
+
     def test_is_digit_factory(self):
         # Given
         config = {
@@ -416,6 +444,66 @@ class TestCRFFeatures(SnipsTest):
         self.assertEqual(res8, None)
         self.assertEqual(res9, UNIT_PREFIX)
 
+    def test_entity_match_factory_should_compute_base_features(self):
+        # Given
+        config = {
+            "factory_name": "entity_match",
+            "args": {
+                "tagging_scheme_code": TaggingScheme.BILOU.value,
+                "use_stemming": False
+            },
+            "offsets": [0, 1]
+        }
+
+        tokens = tokenize("2 dummy a and dummy_c", LANGUAGE_EN)
+        factory = get_feature_factory(config)
+        dataset = deepcopy(SAMPLE_DATASET)
+        dataset = validate_and_format_dataset(dataset)
+        factory.fit(dataset, "dummy_intent_1")
+
+        # When
+        base_features = factory.compute_base_features(tokens)
+
+        # Then
+        expected_base_features = {
+            "entity_match_dummy_entity_1": [
+                BEGINNING_PREFIX, INSIDE_PREFIX, LAST_PREFIX, None, None],
+            "entity_match_dummy_entity_2": [None, None, None, None,
+                                            UNIT_PREFIX]
+        }
+        self.assertDictEqual(expected_base_features, base_features)
+
+    def test_entity_match_factory_should_prefer_longest_matches(self):
+        # Given
+        config = {
+            "factory_name": "entity_match",
+            "args": {
+                "tagging_scheme_code": TaggingScheme.BIO.value,
+                "use_stemming": False,
+                "language_code": LANGUAGE_EN,
+                "collections": {
+                    "city": ["new york", "york", "new york city", "paris"],
+                    "street": ["york street", "city"]
+                }
+            },
+            "offsets": [0]
+        }
+        factory = get_feature_factory(config)
+        tokens = tokenize("from new york city to york street", LANGUAGE_EN)
+
+        # When
+        base_features = factory.compute_base_features(tokens)
+
+        # Then
+        expected_base_features = {
+            "entity_match_city": [None, BEGINNING_PREFIX, INSIDE_PREFIX,
+                                  INSIDE_PREFIX, None, BEGINNING_PREFIX,
+                                  None],
+            "entity_match_street": [None, None, None, BEGINNING_PREFIX, None,
+                                    BEGINNING_PREFIX, INSIDE_PREFIX]
+        }
+        self.assertDictEqual(expected_base_features, base_features)
+
     @patch("snips_nlu.slot_filler.feature_factory.get_supported_entities")
     def test_builtin_entity_match_factory(self, mock_supported_entities):
         # Given
@@ -473,3 +561,56 @@ class TestCRFFeatures(SnipsTest):
         self.assertEqual(res7, None)
         self.assertEqual(res8, None)
         self.assertEqual(res9, None)
+
+    @patch("snips_nlu.slot_filler.feature_factory.get_builtin_entities")
+    @patch("snips_nlu.slot_filler.feature_factory.get_supported_entities")
+    def test_builtin_entity_match_factory_should_parse_once(
+            self, mock_supported_entities, mock_get_builtin_entities):
+        # Given
+        mock_supported_entities.return_value = {SNIPS_NUMBER, SNIPS_DATETIME}
+
+        mock_get_builtin_entities.return_value = MOCKED_BUILTIN_ENTITIES
+
+        config = {
+            "factory_name": "builtin_entity_match",
+            "args": {
+                "tagging_scheme_code": TaggingScheme.BILOU.value,
+            },
+            "offsets": [-1, 0]
+        }
+
+        tokens = tokenize("one tea tomorrow at 2pm", LANGUAGE_EN)
+        cache = [{TOKEN_NAME: token} for token in tokens]
+        factory = get_feature_factory(config)
+        factory.fit({"language": "en"}, None)
+
+        # When
+        base_features = factory.compute_base_features(tokens)
+        for feature in factory.build_features():
+            for token_index in range(len(tokens)):
+                feature.compute(token_index, cache)
+
+        # Then
+        expected_base_features = {
+            "builtin_entity_match_snips/datetime": [
+                None, None, BEGINNING_PREFIX, INSIDE_PREFIX, LAST_PREFIX],
+            "builtin_entity_match_snips/number": [
+                UNIT_PREFIX, None, None, None, None],
+        }
+        self.assertDictEqual(expected_base_features, base_features)
+        mock_get_builtin_entities.assert_called_once_with(
+            "one tea tomorrow at 2pm", LANGUAGE_EN, use_cache=True)
+
+
+MOCKED_BUILTIN_ENTITIES = [
+    {
+        RES_VALUE: "one",
+        RES_MATCH_RANGE: {START: 0, END: 3},
+        ENTITY_KIND: SNIPS_NUMBER
+    },
+    {
+        RES_VALUE: "tomorrow at 2pm",
+        RES_MATCH_RANGE: {START: 8, END: 23},
+        ENTITY_KIND: SNIPS_DATETIME
+    }
+]
@@ -1,9 +1,9 @@
 # coding=utf-8
 from __future__ import unicode_literals
 
+import shutil
 from builtins import range
-from mock import MagicMock
-from pathlib import Path
+from mock import MagicMock, patch
 from sklearn_crfsuite import CRF
 
 from snips_nlu.constants import (
@@ -13,6 +13,7 @@ from snips_nlu.pipeline.configs import CRFSlotFillerConfig
 from snips_nlu.preprocessing import Token, tokenize
 from snips_nlu.result import unresolved_slot
 from snips_nlu.slot_filler.crf_slot_filler import (CRFSlotFiller,
+                                                   InMemoryCRF,
                                                    _disambiguate_builtin_entities,
                                                    _ensure_safe,
                                                    _filter_overlapping_builtins,
@@ -47,6 +48,31 @@ class TestCRFSlotFiller(FixtureTest):
                             slot_name='number_of_cups')]
         self.assertListEqual(slots, expected_slots)
 
+    def test_should_get_same_slots_with_viterbi_decoding(self):
+        # Given
+        dataset = WEATHER_DATASET
+        intent = "SearchWeatherForecast"
+        exhaustive_slot_filler = CRFSlotFiller(
+            CRFSlotFillerConfig(random_seed=42)).fit(dataset, intent)
+        viterbi_slot_filler = CRFSlotFiller(
+            CRFSlotFillerConfig(random_seed=42,
+                                builtin_slots_decoding="viterbi")).fit(
+            dataset, intent)
+        texts = [
+            "Give me the weather at 9p.m. in Paris",
+            "What's the weather like today and tomorrow at 8am in Lyon",
+            "Will it rain 3 days from now or next week in Barcelona",
+        ]
+
+        # When
+        exhaustive_slots = [exhaustive_slot_filler.get_slots(text)
+                            for text in texts]
+        viterbi_slots = [viterbi_slot_filler.get_slots(text)
+                         for text in texts]
+
+        # Then
+        self.assertListEqual(exhaustive_slots, viterbi_slots)
+
     def test_should_get_builtin_slots(self):
         # Given
         dataset = WEATHER_DATASET
@@ -71,6 +97,25 @@ class TestCRFSlotFiller(FixtureTest):
         ]
         self.assertListEqual(expected_slots, slots)
 
+    def test_should_compute_features_once_when_getting_builtin_slots(self):
+        # Given
+        dataset = WEATHER_DATASET
+        config = CRFSlotFillerConfig(random_seed=42)
+        intent = "SearchWeatherForecast"
+        slot_filler = CRFSlotFiller(config).fit(dataset, intent)
+        text = "Give me the weather at 9p.m. in Paris"
+        expected_slots = slot_filler.get_slots(text)
+
+        # When
+        with patch.object(slot_filler, "compute_features",
+                          wraps=slot_filler.compute_features) \
+                as mocked_compute_features:
+            slots = slot_filler.get_slots(text)
+
+        # Then
+        self.assertEqual(1, mocked_compute_features.call_count)
+        self.assertListEqual(expected_slots, slots)
+
     def test_should_not_use_crf_when_dataset_with_no_slots(self):
         # Given
         dataset = {
@@ -136,6 +181,24 @@ class TestCRFSlotFiller(FixtureTest):
         self.assertEqual(1.0, res1)
         self.assertEqual(0.0, res2)
 
+    def test_should_substitute_unseen_labels_in_sequence_probability(self):
+        # Given
+        slot_filler = CRFSlotFiller(CRFSlotFillerConfig(random_seed=42)).fit(
+            WEATHER_DATASET, "SearchWeatherForecast")
+        tokens = tokenize("Will it rain in Paris", "en")
+
+        # When
+        with patch("snips_nlu.slot_filler.crf_slot_filler._decode_tag") \
+                as mocked_decode_tag:
+            res1 = slot_filler.get_sequence_probability(
+                tokens, ["O", "O", "O", "O", "B-unseen_slot"])
+            res2 = slot_filler.get_sequence_probability(
+                tokens, ["O", "O", "O", "O", "O"])
+
+        # Then
+        self.assertEqual(res2, res1)
+        mocked_decode_tag.assert_not_called()
+
     def test_should_parse_naughty_strings(self):
         # Given
         dataset = SAMPLE_DATASET
@@ -294,6 +357,7 @@ class TestCRFSlotFiller(FixtureTest):
 
         expected_slot_filler_dict = {
             "crf_model_file": None,
+            "crf_weights_file": None,
             "language_code": None,
             "config": config.to_dict(),
             "intent": None,
@@ -393,7 +457,7 @@ class TestCRFSlotFiller(FixtureTest):
         metadata_path = self.tmp_file_path / "metadata.json"
         self.assertJsonContent(metadata_path, {"unit_name": "crf_slot_filler"})
 
-        expected_crf_file = Path(slot_filler.crf_model.modelfile.name).name
+        expected_crf_file = "model.crfsuite"
         self.assertTrue((self.tmp_file_path / expected_crf_file).exists())
 
         expected_feature_factories = [
@@ -413,6 +477,7 @@ class TestCRFSlotFiller(FixtureTest):
             feature_factory_configs=expected_feature_factories)
         expected_slot_filler_dict = {
             "crf_model_file": expected_crf_file,
+            "crf_weights_file": None,
             "language_code": "en",
             "config": expected_config.to_dict(),
             "intent": intent,
@@ -494,8 +559,77 @@ class TestCRFSlotFiller(FixtureTest):
                          expected_slot_name_mapping)
         self.assertDictEqual(expected_config.to_dict(),
                              slot_filler.config.to_dict())
-        crf_path = Path(slot_filler.crf_model.modelfile.name)
-        self.assertFileContent(crf_path, "foo bar")
+        self.assertIsInstance(slot_filler.crf_model, InMemoryCRF)
+        self.assertEqual(b"foo bar", slot_filler.crf_model.model_data)
+        self.assertIsNone(slot_filler.crf_model.modelfile.name)
+
+    def test_should_get_slots_after_deleting_persisted_files(self):
+        # Given
+        dataset = BEVERAGE_DATASET
+        config = CRFSlotFillerConfig(random_seed=42)
+        intent = "MakeTea"
+        slot_filler = CRFSlotFiller(config).fit(dataset, intent)
+        slot_filler.persist(self.tmp_file_path)
+        loaded_slot_filler = CRFSlotFiller.from_path(self.tmp_file_path)
+        shutil.rmtree(str(self.tmp_file_path))
+
+        # When
+        slots = loaded_slot_filler.get_slots("make me two cups of tea")
+
+        # Then
+        expected_slots = slot_filler.get_slots("make me two cups of tea")
+        self.assertListEqual(expected_slots, slots)
+
+    def test_should_get_same_slots_with_numpy_backend(self):
+        # Given
+        dataset = WEATHER_DATASET
+        intent = "SearchWeatherForecast"
+        crfsuite_slot_filler = CRFSlotFiller(
+            CRFSlotFillerConfig(random_seed=42)).fit(dataset, intent)
+        numpy_slot_filler = CRFSlotFiller(
+            CRFSlotFillerConfig(random_seed=42,
+                                inference_backend="numpy")).fit(
+            dataset, intent)
+        numpy_slot_filler.persist(self.tmp_file_path)
+        loaded_slot_filler = CRFSlotFiller.from_path(self.tmp_file_path)
+        texts = [
+            "Give me the weather at 9p.m. in Paris",
+            "What's the weather like today and tomorrow at 8am in Lyon",
+            "Will it rain in Barcelona",
+            "weather",
+        ]
+
+        # When
+        crfsuite_slots = [crfsuite_slot_filler.get_slots(text)
+                          for text in texts]
+        numpy_slots = [loaded_slot_filler.get_slots(text) for text in texts]
+
+        # Then
+        self.assertTrue((self.tmp_file_path / "weights.npz").exists())
+        self.assertListEqual(crfsuite_slots, numpy_slots)
+
+    def test_should_get_slots_batch(self):
+        # Given
+        dataset = WEATHER_DATASET
+        intent = "SearchWeatherForecast"
+        texts = [
+            "Give me the weather at 9p.m. in Paris",
+            "",
+            "What's the weather like today and tomorrow at 8am in Lyon",
+            "Will it rain in Barcelona",
+        ]
+        for backend in ["crfsuite", "numpy"]:
+            config = CRFSlotFillerConfig(random_seed=42,
+                                         inference_backend=backend)
+            slot_filler = CRFSlotFiller(config).fit(dataset, intent)
+
+            # When
+            batch_slots = slot_filler.get_slots_batch(texts)
+
+            # Then
+            expected_batch_slots = [slot_filler.get_slots(text)
+                                    for text in texts]
+            self.assertListEqual(expected_batch_slots, batch_slots)
 
     def test_should_be_serializable_when_fitted_without_slots(self):
         # Given
@@ -629,6 +763,48 @@ class TestCRFSlotFiller(FixtureTest):
         ]
         self.assertListEqual(expected_features, features_with_drop_out)
 
+    def test_should_compute_offset_features_from_base_features(self):
+        # Given
+        features_factories = [
+            {
+                "factory_name": NgramFactory.name,
+                "args": {
+                    "n": 1,
+                    "use_stemming": False,
+                    "common_words_gazetteer_name": None
+                },
+                "offsets": [-1, 0, 2]
+            },
+            {
+                "factory_name": IsDigitFactory.name,
+                "args": {},
+                "offsets": [0, 1]
+            },
+        ]
+        slot_filler_config = CRFSlotFillerConfig(
+            feature_factory_configs=features_factories)
+        slot_filler = CRFSlotFiller(slot_filler_config)
+        slot_filler.fit(SAMPLE_DATASET, intent="dummy_intent_1")
+        ngram_factory = slot_filler.features_factories[0]
+        ngram_factory.compute_base_features = MagicMock(
+            side_effect=ngram_factory.compute_base_features)
+
+        tokens = tokenize("foo 2 world bar", LANGUAGE_EN)
+
+        # When
+        features = slot_filler.compute_features(tokens)
+
+        # Then
+        expected_features = [
+            {"ngram_1": "foo", "ngram_1[+2]": "world", "is_digit[+1]": "1"},
+            {"ngram_1[-1]": "foo", "ngram_1": "2", "ngram_1[+2]": "bar",
+             "is_digit": "1"},
+            {"ngram_1[-1]": "2", "ngram_1": "world"},
+            {"ngram_1[-1]": "world", "ngram_1": "bar"},
+        ]
+        self.assertListEqual(expected_features, features)
+        ngram_factory.compute_base_features.assert_called_once_with(tokens)
+
     def test_spans_to_tokens_indexes(self):
         # Given
         spans = [
@@ -0,0 +1,178 @@
+from __future__ import unicode_literals
+
+from builtins import range, str, zip
+from itertools import product
+
+import numpy as np
+
+from snips_nlu.slot_filler.crf_weights import CRFWeights
+from snips_nlu.tests.utils import FixtureTest
+
+
+class TestCRFWeights(FixtureTest):
+    def test_should_compute_state_scores(self):
+        # Given
+        weights = CRFWeights(
+            labels=["O", "B-color"],
+            attributes=["ngram_1:red", "is_digit:1"],
+            state_weights=np.array([[1.0, 3.0], [0.5, -1.0]]),
+            transition_weights=np.zeros((2, 2)))
+        features = [
+            {"ngram_1": "red", "is_digit": "1"},
+            {"ngram_1": "blue"},
+        ]
+
+        # When
+        scores = weights.compute_state_scores(features)
+
+        # Then
+        expected_scores = np.array([[1.5, 2.0], [0.0, 0.0]])
+        np.testing.assert_array_almost_equal(expected_scores, scores)
+
+    def test_should_index_features_values(self):
+        # Given
+        weights = CRFWeights(
+            labels=["O", "B-time"],
+            attributes=["ngram_1:red", "is_digit:1", "ngram_1:10:30",
+                        "ngram_1[-1]:red"],
+            state_weights=np.zeros((4, 2)),
+            transition_weights=np.zeros((2, 2)))
+
+        # When
+        values_indexes = weights.index_features_values(
+            ["ngram_1", "ngram_1[-1]", "is_first"])
+
+        # Then
+        expected_values_indexes = [
+            {"red": 0, "10:30": 2},
+            {"red": 3},
+            dict()
+        ]
+        self.assertListEqual(expected_values_indexes, values_indexes)
+
+    def test_should_compute_indexed_state_scores(self):
+        # Given
+        weights = CRFWeights(
+            labels=["O", "B-color"],
+            attributes=["ngram_1:red", "is_digit:1", "is_first:1"],
+            state_weights=np.array([[1.0, 3.0], [0.5, -1.0], [0.2, 0.1]]),
+            transition_weights=np.zeros((2, 2)))
+        features = [
+            {"ngram_1": "red", "is_digit": "1"},
+            {"ngram_1": "blue"},
+            {"is_first": "1", "is_digit": "1"},
+        ]
+
+        # When
+        scores = weights.compute_indexed_state_scores(
+            n_tokens=3, attributes_indexes=[0, 1, 2, 1], tokens_indexes=[0, 2],
+            starts=[0, 2])
+
+        # Then
+        expected_scores = weights.compute_state_scores(features)
+        np.testing.assert_array_almost_equal(expected_scores, scores)
+
+    def test_should_decode_segments(self):
+        # Given
+        random_state = np.random.RandomState(42)
+        n_labels = 4
+        weights = CRFWeights(
+            labels=[str(i) for i in range(n_labels)],
+            attributes=[],
+            state_weights=np.zeros((0, n_labels)),
+            transition_weights=random_state.randn(n_labels, n_labels))
+        segments_candidates = [
+            [[0]],
+            [[1, 2], [3, 3], [0, 0]],
+            [[2]],
+            [[1, 1, 2], [3, 0, 0]],
+        ]
+        state_scores = random_state.randn(7, n_labels)
+
+        def sequence_score(candidates_indexes):
+            labels = []
+            for candidates, index in zip(segments_candidates,
+                                         candidates_indexes):
+                labels += candidates[index]
+            score = sum(state_scores[i, label]
+                        for i, label in enumerate(labels))
+            score += sum(weights.transition_weights[label_from, label_to]
+                         for label_from, label_to in zip(labels, labels[1:]))
+            return score
+
+        # When
+        best_candidates = weights.decode_segments(
+            state_scores, segments_candidates)
+
+        # Then
+        expected_best_candidates = max(
+            product(*(range(len(candidates))
+                      for candidates in segments_candidates)),
+            key=sequence_score)
+        self.assertListEqual(list(expected_best_candidates), best_candidates)
+
+    def test_should_find_best_sequence_with_viterbi(self):
+        # Given
+        random_state = np.random.RandomState(42)
+        n_labels = 3
+        weights = CRFWeights(
+            labels=[str(i) for i in range(n_labels)],
+            attributes=[],
+            state_weights=np.zeros((0, n_labels)),
+            transition_weights=random_state.randn(n_labels, n_labels))
+        state_scores = random_state.randn(5, n_labels)
+
+        # When
+        best_labels = weights.viterbi(state_scores)
+
+        # Then
+        expected_best_labels = max(
+            product(range(n_labels), repeat=5),
+            key=lambda labels: weights.sequence_score(state_scores,
+                                                      list(labels)))
+        self.assertListEqual(list(expected_best_labels), best_labels)
+        self.assertListEqual([], weights.viterbi(np.zeros((0, n_labels))))
+
+    def test_should_decode_batch_with_viterbi(self):
+        # Given
+        random_state = np.random.RandomState(42)
+        n_labels = 4
+        weights = CRFWeights(
+            labels=[str(i) for i in range(n_labels)],
+            attributes=[],
+            state_weights=np.zeros((0, n_labels)),
+            transition_weights=random_state.randn(n_labels, n_labels))
+        batch_state_scores = [random_state.randn(n_tokens, n_labels)
+                              for n_tokens in [3, 0, 7, 1, 5]]
+
+        # When
+        batch_best_labels = weights.viterbi_batch(batch_state_scores)
+
+        # Then
+        expected_batch_best_labels = [
+            weights.viterbi(state_scores)
+            for state_scores in batch_state_scores]
+        self.assertListEqual(expected_batch_best_labels, batch_best_labels)
+        self.assertListEqual([], weights.viterbi_batch([]))
+
+    def test_should_be_serializable(self):
+        # Given
+        weights = CRFWeights(
+            labels=["O", "B-color"],
+            attributes=["ngram_1:red", "is_digit:1"],
+            state_weights=np.array([[1.0, 3.0], [0.5, -1.0]]),
+            transition_weights=np.array([[0.2, 0.1], [-0.3, 0.4]]))
+        self.tmp_file_path.mkdir()
+        weights_path = self.tmp_file_path / "weights.npz"
+
+        # When
+        weights.persist(weights_path)
+        loaded_weights = CRFWeights.from_path(weights_path)
+
+        # Then
+        self.assertListEqual(weights.labels, loaded_weights.labels)
+        self.assertListEqual(weights.attributes, loaded_weights.attributes)
+        np.testing.assert_array_equal(weights.state_weights,
+                                      loaded_weights.state_weights)
+        np.testing.assert_array_equal(weights.transition_weights,
+                                      loaded_weights.transition_weights)
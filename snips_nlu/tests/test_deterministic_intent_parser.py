@@ -10,7 +10,8 @@ from snips_nlu.constants import (
     START, TEXT, VALUE)
 from snips_nlu.dataset import validate_and_format_dataset
 from snips_nlu.intent_parser.deterministic_intent_parser import (
-    DeterministicIntentParser, _deduplicate_overlapping_slots,
+    DeterministicIntentParser, _IntentMatcher, _PatternsMatcher,
+    _count_groups, _deduplicate_overlapping_slots, _get_pattern_first_token,
     _get_range_shift, _replace_builtin_entities,
     _replace_tokenized_out_characters)
 from snips_nlu.pipeline.configs import DeterministicIntentParserConfig
@@ -322,6 +323,97 @@ class TestDeterministicIntentParser(FixtureTest):
             # Then
             self.assertListEqual(expected_slots, parsing[RES_SLOTS])
 
+    def test_should_get_slots_with_entity_placeholders(self):
+        # Given
+        dataset = self.slots_dataset
+        dataset = validate_and_format_dataset(dataset)
+        config = DeterministicIntentParserConfig(use_entity_placeholders=True)
+
+        parser = DeterministicIntentParser(config).fit(dataset)
+        texts = [
+            (
+                "this is a dummy a query with another dummy_c at 10p.m. or at"
+                " 12p.m.",
+                [
+                    unresolved_slot(match_range=(10, 17), value="dummy a",
+                                    entity="dummy_entity_1",
+                                    slot_name="dummy_slot_name"),
+                    unresolved_slot(match_range=(37, 44), value="dummy_c",
+                                    entity="dummy_entity_2",
+                                    slot_name="dummy_slot_name2"),
+                    unresolved_slot(match_range=(45, 54), value="at 10p.m.",
+                                    entity="snips/datetime",
+                                    slot_name="startTime"),
+                    unresolved_slot(match_range=(58, 67), value="at 12p.m.",
+                                    entity="snips/datetime",
+                                    slot_name="startTime")
+                ]
+            ),
+            (
+                " this is a dummy b ",
+                [
+                    unresolved_slot(match_range=(11, 18), value="dummy b",
+                                    entity="dummy_entity_1",
+                                    slot_name="dummy_slot_name")
+                ]
+            ),
+            (
+                " at 8am ’ there is a dummy  a",
+                [
+                    unresolved_slot(match_range=(1, 7), value="at 8am",
+                                    entity="snips/datetime",
+                                    slot_name="startTime"),
+                    unresolved_slot(match_range=(21, 29), value="dummy  a",
+                                    entity="dummy_entity_1",
+                                    slot_name="dummy_slot_name")
+                ]
+            )
+        ]
+
+        for text, expected_slots in texts:
+            # When
+            parsing = parser.parse(text)
+
+            # Then
+            self.assertListEqual(expected_slots, parsing[RES_SLOTS])
+
+    def test_should_not_embed_entity_values_with_entity_placeholders(self):
+        # Given
+        dataset = self.slots_dataset
+        dataset = validate_and_format_dataset(dataset)
+        config = DeterministicIntentParserConfig(use_entity_placeholders=True)
+
+        # When
+        parser = DeterministicIntentParser(config).fit(dataset)
+
+        # Then
+        for pattern in parser.patterns["dummy_intent_1"]:
+            self.assertNotIn("dummy", pattern)
+        self.assertListEqual(["dummy_entity_1"],
+                             parser.entity_values["dummy a"])
+
+    def test_should_get_slots_after_deserialization_with_placeholders(self):
+        # Given
+        dataset = self.slots_dataset
+        dataset = validate_and_format_dataset(dataset)
+        config = DeterministicIntentParserConfig(use_entity_placeholders=True)
+        parser = DeterministicIntentParser(config).fit(dataset)
+
+        # When
+        parser.persist(self.tmp_file_path)
+        deserialized_parser = DeterministicIntentParser.from_path(
+            self.tmp_file_path)
+        parsing = deserialized_parser.parse(" this is a dummy b ")
+
+        # Then
+        self.assertTrue(deserialized_parser.config.use_entity_placeholders)
+        expected_slots = [
+            unresolved_slot(match_range=(11, 18), value="dummy b",
+                            entity="dummy_entity_1",
+                            slot_name="dummy_slot_name")
+        ]
+        self.assertListEqual(expected_slots, parsing[RES_SLOTS])
+
     def test_should_get_slots_after_deserialization(self):
         # Given
         dataset = self.slots_dataset
@@ -810,3 +902,104 @@ class TestDeterministicIntentParser(FixtureTest):
 
         # Then
         self.assertEqual("__hello__it_s_me_!__", cleaned_string)
+
+    def test_should_match_first_pattern_of_intent_matcher(self):
+        # Given
+        patterns = [
+            r"^\s*(?P<group_%s>foo%s)\s*$" % (i, i) for i in range(60)]
+        patterns += [
+            r"^\s*(?P<group_60>foo\d+)\s*$",
+            r"^\s*(?P<group_61>bar|baz)\s*$",
+            r"^\s*bar\s*$",
+            r"^\s*turn\s*on\s*$"
+        ]
+
+        # When
+        matcher = _IntentMatcher(patterns)
+        matches = [matcher.match(text) for text in
+                   ["foo5", "FOO59", "foo100", "bar", "turnon", "foo"]]
+
+        # Then
+        self.assertListEqual([5, 59, 60, 61, 63, None],
+                             [pattern_index for pattern_index, _ in matches])
+        self.assertEqual("FOO59", matches[1][1].group("group_59"))
+
+    def test_should_combine_patterns_in_several_regexes(self):
+        # Given
+        patterns = [
+            r"^\s*(?P<group_%s>foo%s)\s*$" % (i, i) for i in range(60)]
+
+        # When
+        matcher = _PatternsMatcher(list(enumerate(patterns)))
+        pattern_index, found_result = matcher.match("foo59")
+
+        # Then
+        self.assertGreater(len(matcher.regexes), 1)
+        self.assertEqual(59, pattern_index)
+        self.assertEqual("foo59", found_result.group("group_59"))
+        self.assertIsNone(found_result.group("group_58"))
+
+    def test_should_compile_patterns_lazily(self):
+        # Given
+        dataset = validate_and_format_dataset(self.slots_dataset)
+        parser_dict = DeterministicIntentParser().fit(dataset).to_dict()
+        parser = DeterministicIntentParser.from_dict(parser_dict)
+        self.assertDictEqual(dict(), parser._matchers_per_intent)
+
+        # When
+        parsing = parser.parse("this is a dummy b")
+
+        # Then
+        self.assertEqual("dummy_intent_1",
+                         parsing[RES_INTENT][RES_INTENT_NAME])
+        self.assertListEqual(["dummy_intent_1"],
+                             list(parser._matchers_per_intent))
+
+    def test_should_memoize_compiled_regexes(self):
+        # Given
+        dataset = validate_and_format_dataset(self.slots_dataset)
+        parser = DeterministicIntentParser().fit(dataset)
+
+        # When
+        regexes = parser.regexes_per_intent
+        same_regexes = parser.regexes_per_intent
+        parser.fit(dataset)
+        refitted_regexes = parser.regexes_per_intent
+
+        # Then
+        self.assertIs(regexes, same_regexes)
+        self.assertIsNot(regexes, refitted_regexes)
+
+    def test_should_count_pattern_groups(self):
+        # Given
+        patterns = [
+            r"^\s*(?P<group_0>a|b)\s*(?P<group_1>c)\s*$",
+            r"(?:a)(b)\(c\)[(]",
+            r"foo"
+        ]
+
+        # When
+        n_groups = [_count_groups(p) for p in patterns]
+
+        # Then
+        self.assertListEqual([2, 1, 0], n_groups)
+
+    def test_should_get_pattern_first_token(self):
+        # Given
+        patterns = [
+            r"^\s*Turn\s*on\s*$",
+            r"^\s*(?P<group_0>%SNIPSNUMBER%)\s*cups\s*$",
+            r"^\s*(?P<group_1>living\s*room)\s*on\s*$",
+            r"^\s*a\-b\s*$",
+            r"^\s*(?P<group_2>foo|bar)\s*$",
+            r"^\s*hello?\s*$",
+            r"(?P<hello_group>hello?)"
+        ]
+
+        # When
+        first_tokens = [_get_pattern_first_token(p) for p in patterns]
+
+        # Then
+        expected_first_tokens = ["turn", "%snipsnumber%", "living", "a-b",
+                                 None, None, None]
+        self.assertListEqual(expected_first_tokens, first_tokens)
@@ -16,12 +16,12 @@ from snips_nlu.intent_classifier.log_reg_classifier_utils import \
     text_to_utterance
 from snips_nlu.languages import get_default_sep
 from snips_nlu.pipeline.configs import FeaturizerConfig
-from snips_nlu.tests.utils import SnipsTest
+from snips_nlu.tests.utils import FixtureTest
 from snips_nlu.preprocessing import tokenize_light
 from snips_nlu.utils import json_string
 
 
-class TestIntentClassifierFeaturizer(SnipsTest):
+class TestIntentClassifierFeaturizer(FixtureTest):
     def test_should_be_serializable(self):
         # Given
         language = LANGUAGE_EN
@@ -151,6 +151,36 @@ class TestIntentClassifierFeaturizer(SnipsTest):
                 in iteritems(entity_utterances_to_feature_names)
             })
 
+    def test_should_be_persisted_and_loaded(self):
+        # Given
+        featurizer_dict = {
+            "config": {
+                "pvalue_threshold": 0.4,
+                "sublinear_tf": False,
+                "word_clusters_name": "brown_clusters"
+            },
+            "language_code": LANGUAGE_EN,
+            "tfidf_vectorizer": {
+                "idf_diag": [1.52, 1.21, 1.04],
+                "vocab": {"hello": 0, "beautiful": 1, "world": 2}
+            },
+            "best_features": [0, 1],
+            "entity_utterances_to_feature_names": {
+                "entity_1": ["entityfeatureentity_1"]
+            },
+            "unknown_words_replacement_string": None
+        }
+        featurizer = Featurizer.from_dict(featurizer_dict)
+
+        # When
+        featurizer.persist(self.tmp_file_path)
+        loaded_featurizer = Featurizer.from_path(self.tmp_file_path)
+
+        # Then
+        self.assertTrue((self.tmp_file_path / "vocabulary.npy").exists())
+        self.assertTrue((self.tmp_file_path / "idf_diag.npy").exists())
+        self.assertDictEqual(featurizer_dict, loaded_featurizer.to_dict())
+
     @mock.patch("snips_nlu.dataset.get_string_variations")
     def test_get_utterances_entities(self, mocked_get_string_variations):
         # Given
@@ -338,6 +368,33 @@ class TestIntentClassifierFeaturizer(SnipsTest):
 
         self.assertListEqual(utterances, expected_utterances)
 
+    @patch("snips_nlu.intent_classifier.featurizer.get_builtin_entities")
+    @patch("snips_nlu.intent_classifier.featurizer.stem")
+    def test_should_preprocess_distinct_values_once(
+            self, mocked_stem, mocked_get_builtin_entities):
+        # Given
+        mocked_stem.side_effect = lambda text, language: text
+        mocked_get_builtin_entities.return_value = []
+        featurizer = Featurizer(
+            LANGUAGE_EN, None, entity_utterances_to_feature_names=dict())
+        utterances = [
+            text_to_utterance("hello world"),
+            text_to_utterance("hello you"),
+            text_to_utterance("hello world"),
+        ]
+
+        # When
+        preprocessed_utterances = featurizer.preprocess_utterances(utterances)
+
+        # Then
+        expected_utterances = ["hello world", "hello you", "hello world"]
+        self.assertListEqual(expected_utterances, preprocessed_utterances)
+        stemmed_texts = [args[0] for args, _ in mocked_stem.call_args_list]
+        self.assertListEqual(
+            sorted(["hello", "world", "you", "hello world", "hello you"]),
+            sorted(stemmed_texts))
+        self.assertEqual(2, mocked_get_builtin_entities.call_count)
+
     def test_featurizer_should_exclude_replacement_string(self):
         # Given
         language = LANGUAGE_EN
@@ -365,6 +422,94 @@ class TestIntentClassifierFeaturizer(SnipsTest):
         self.assertNotIn(replacement_string,
                          featurizer.entity_utterances_to_feature_names)
 
+    @patch("snips_nlu.intent_classifier.featurizer.chi2")
+    @patch("snips_nlu.intent_classifier.featurizer.get_stop_words")
+    @patch("snips_nlu.intent_classifier.featurizer.stem")
+    def test_should_select_best_features(
+            self, mocked_stem, mocked_get_stop_words, mocked_chi2):
+        # Given
+        language = LANGUAGE_EN
+        dataset = {"entities": {}}
+        mocked_stem.side_effect = lambda text, language: text
+        mocked_get_stop_words.return_value = {"the", "an", "of"}
+        words_pvalues = {
+            "hello": 0.1,
+            "the": 0.3,
+            "world": 0.5,
+            "an": 0.1,
+            "bird": 0.2,
+        }
+        featurizer = Featurizer(
+            language, unknown_words_replacement_string=None,
+            config=FeaturizerConfig(pvalue_threshold=0.4))
+
+        def chi2_function(X, y):  # pylint: disable=unused-argument
+            vocabulary = featurizer.tfidf_vectorizer.vocabulary_
+            pvalues = np.zeros(len(vocabulary))
+            for word, index in iteritems(vocabulary):
+                pvalues[index] = words_pvalues[word]
+            return None, pvalues
+
+        mocked_chi2.side_effect = chi2_function
+        utterances = [text_to_utterance("hello the world"),
+                      text_to_utterance("an bird")]
+        y = np.array([0, 1])
+
+        # When
+        featurizer.fit(dataset, utterances, y)
+
+        # Then
+        vocabulary = featurizer.tfidf_vectorizer.vocabulary_
+        expected_best_features = sorted(
+            vocabulary[word] for word in ["hello", "an", "bird"])
+        self.assertListEqual(expected_best_features, featurizer.best_features)
+
+    def test_should_transform_like_tfidf_vectorizer(self):
+        # Given
+        language = LANGUAGE_EN
+        dataset = {
+            "entities": {
+                "dummy1": {
+                    "utterances": {
+                        "coffee": "coffee",
+                        "tea": "tea"
+                    }
+                }
+            }
+        }
+        utterances = [
+            text_to_utterance("make me a hot cup of tea"),
+            text_to_utterance("make me five coffees"),
+            text_to_utterance("make me a tea tea"),
+            text_to_utterance("I want three cups of coffee please"),
+            text_to_utterance("hello there"),
+            text_to_utterance("hello world")
+        ]
+        y = np.array([0, 1, 0, 1, 2, 2])
+        queries = [
+            text_to_utterance("make me a cup of coffee"),
+            text_to_utterance("foo bar"),
+            text_to_utterance("tea TEA tea please, hello")
+        ]
+
+        for sublinear_tf in [False, True]:
+            config = FeaturizerConfig(sublinear_tf=sublinear_tf,
+                                      pvalue_threshold=0.5)
+            featurizer = Featurizer(
+                language, unknown_words_replacement_string=None,
+                config=config).fit(dataset, utterances, y)
+
+            # When
+            features = featurizer.transform(queries)
+
+            # Then
+            preprocessed_queries = featurizer.preprocess_utterances(queries)
+            expected_features = featurizer.tfidf_vectorizer.transform(
+                preprocessed_queries)[:, featurizer.best_features]
+            self.assertEqual(expected_features.shape, features.shape)
+            np.testing.assert_array_almost_equal(
+                expected_features.toarray(), features.toarray())
+
     def test_featurizer_should_be_serialized_when_not_fitted(self):
         # Given
         language = LANGUAGE_EN
@@ -66,6 +66,40 @@ class TestLogRegIntentClassifier(FixtureTest):
         self.assertEqual("MakeCoffee", res2[RES_INTENT_NAME])
         self.assertEqual(None, res3)
 
+    def test_should_get_intent_batch(self):
+        # Given
+        dataset = validate_and_format_dataset(BEVERAGE_DATASET)
+        classifier = LogRegIntentClassifier().fit(dataset)
+        texts = ["Make me two cups of tea", "bla bla bla", "",
+                 "I want a coffee"]
+
+        # When
+        results = classifier.get_intent_batch(texts, ["MakeCoffee"])
+
+        # Then
+        expected_results = [classifier.get_intent(text, ["MakeCoffee"])
+                            for text in texts]
+        self.assertListEqual(expected_results, results)
+
+    def test_should_predict_same_probabilities_as_sgd_classifier(self):
+        # Given
+        dataset = validate_and_format_dataset(BEVERAGE_DATASET)
+        classifier = LogRegIntentClassifier().fit(dataset)
+        utterances = [text_to_utterance(text) for text in
+                      ["Make me two cups of tea", "bla bla bla",
+                       "I want a coffee"]]
+        features = classifier.featurizer.transform(utterances)
+
+        # When
+        # pylint: disable=protected-access
+        probas = classifier._predict_proba(features, intents_filter=None)
+        # pylint: enable=protected-access
+
+        # Then
+        expected_probas = 1. / (
+            1. + np.exp(-classifier.classifier.decision_function(features)))
+        np.testing.assert_array_almost_equal(expected_probas, probas)
+
     def test_should_not_get_intent_when_not_fitted(self):
         # Given
         intent_classifier = LogRegIntentClassifier()
@@ -88,13 +122,8 @@ class TestLogRegIntentClassifier(FixtureTest):
         expected_intent = None
         self.assertEqual(intent, expected_intent)
 
-    @patch('snips_nlu.intent_classifier.featurizer.Featurizer.to_dict')
-    def test_should_be_serializable(self, mock_to_dict):
+    def test_should_be_serializable(self):
         # Given
-        mocked_dict = {"mocked_featurizer_key": "mocked_featurizer_value"}
-
-        mock_to_dict.return_value = mocked_dict
-
         dataset = validate_and_format_dataset(SAMPLE_DATASET)
 
         intent_classifier = LogRegIntentClassifier().fit(dataset)
@@ -109,19 +138,81 @@ class TestLogRegIntentClassifier(FixtureTest):
         intent_list.append(None)
         expected_dict = {
             "config": LogRegIntentClassifierConfig().to_dict(),
-            "coeffs": coeffs,
-            "intercept": intercept,
+            "coeffs_file": "coeffs.npy",
+            "intercept_file": "intercept.npy",
             "t_": 701.0,
             "intent_list": intent_list,
-            "featurizer": mocked_dict
+            "featurizer_dir": "featurizer"
         }
         metadata = {"unit_name": "log_reg_intent_classifier"}
         self.assertJsonContent(self.tmp_file_path / "metadata.json", metadata)
         self.assertJsonContent(self.tmp_file_path / "intent_classifier.json",
                                expected_dict)
+        self.assertListEqual(
+            coeffs, np.load(str(self.tmp_file_path / "coeffs.npy")).tolist())
+        self.assertListEqual(
+            intercept,
+            np.load(str(self.tmp_file_path / "intercept.npy")).tolist())
+        self.assertTrue(
+            (self.tmp_file_path / "featurizer" / "featurizer.json").exists())
+
+    @patch('snips_nlu.intent_classifier.featurizer.Featurizer.from_path')
+    def test_should_be_deserializable(self, mock_from_path):
+        # Given
+        mocked_featurizer = Featurizer(LANGUAGE_EN, None)
+        mock_from_path.return_value = mocked_featurizer
+
+        intent_list = ["MakeCoffee", "MakeTea", None]
+
+        coeffs = [
+            [1.23, 4.5],
+            [6.7, 8.90],
+            [1.01, 2.345],
+        ]
+
+        intercept = [
+            0.34,
+            0.41,
+            -0.98
+        ]
+
+        t_ = 701.
+
+        config = LogRegIntentClassifierConfig().to_dict()
+
+        classifier_dict = {
+            "coeffs_file": "coeffs.npy",
+            "intercept_file": "intercept.npy",
+            "t_": t_,
+            "intent_list": intent_list,
+            "config": config,
+            "featurizer_dir": "featurizer",
+        }
+        self.tmp_file_path.mkdir()
+        metadata = {"unit_name": "log_reg_intent_classifier"}
+        self.writeJsonContent(self.tmp_file_path / "metadata.json", metadata)
+        self.writeJsonContent(self.tmp_file_path / "intent_classifier.json",
+                              classifier_dict)
+        np.save(str(self.tmp_file_path / "coeffs.npy"), np.array(coeffs))
+        np.save(str(self.tmp_file_path / "intercept.npy"),
+                np.array(intercept))
+
+        # When
+        classifier = LogRegIntentClassifier.from_path(self.tmp_file_path)
+
+        # Then
+        mock_from_path.assert_called_once_with(
+            self.tmp_file_path / "featurizer")
+        self.assertEqual(classifier.intent_list, intent_list)
+        self.assertIsNotNone(classifier.featurizer)
+        self.assertListEqual(classifier.classifier.coef_.tolist(), coeffs)
+        self.assertListEqual(classifier.classifier.intercept_.tolist(),
+                             intercept)
+        self.assertDictEqual(classifier.config.to_dict(), config)
 
     @patch('snips_nlu.intent_classifier.featurizer.Featurizer.from_dict')
-    def test_should_be_deserializable(self, mock_from_dict):
+    def test_should_be_deserializable_from_legacy_json(self,
+                                                       mock_from_dict):
         # Given
         mocked_featurizer = Featurizer(LANGUAGE_EN, None)
         mock_from_dict.return_value = mocked_featurizer
@@ -1,9 +1,12 @@
 # coding=utf-8
 from __future__ import unicode_literals
 
-from builtins import str
+import sys
+from builtins import range, str
 from copy import deepcopy
 from pathlib import Path
+from threading import Thread
+from unittest import skipIf
 
 from mock import patch
 from snips_nlu_ontology import get_all_languages
@@ -16,6 +19,8 @@ from snips_nlu.constants import (
 from snips_nlu.dataset import validate_and_format_dataset
 from snips_nlu.intent_parser import IntentParser
 from snips_nlu.nlu_engine import SnipsNLUEngine
+from snips_nlu.nlu_engine.nlu_engine import get_resolution_builtin_entities
+from snips_nlu.nlu_engine.result_cache import ParseResultCache
 from snips_nlu.pipeline.configs import NLUEngineConfig, \
     ProbabilisticIntentParserConfig, ProcessingUnitConfig
 from snips_nlu.pipeline.units_registry import (
@@ -501,6 +506,203 @@ class TestSnipsNLUEngine(FixtureTest):
         self.assertEqual(result[RES_INTENT][RES_INTENT_NAME], "MakeTea")
         self.assertListEqual(result[RES_SLOTS], expected_slots)
 
+    def test_should_use_result_cache(self):
+        # Given
+        dataset = BEVERAGE_DATASET
+        engine = SnipsNLUEngine().fit(dataset)
+        engine.result_cache = ParseResultCache(size_limit=10)
+        text = "Give me 3 cups of hot tea please"
+        expected_result = engine.parse(text)
+        engine.result_cache.clear()
+
+        # When
+        first_result = engine.parse(text)
+        with patch.object(engine.intent_parsers[0], "parse") as mocked_parse:
+            second_result = engine.parse(text)
+
+        # Then
+        mocked_parse.assert_not_called()
+        self.assertDictEqual(expected_result, first_result)
+        self.assertDictEqual(expected_result, second_result)
+        self.assertEqual(1, engine.result_cache.hits)
+        self.assertEqual(1, engine.result_cache.misses)
+
+    @patch("snips_nlu.nlu_engine.nlu_engine.get_resolution_builtin_entities",
+           wraps=get_resolution_builtin_entities)
+    def test_should_resolve_builtin_slots_on_cache_hit(self, mocked_get):
+        # Given
+        dataset = BEVERAGE_DATASET
+        engine = SnipsNLUEngine().fit(dataset)
+        engine.result_cache = ParseResultCache(size_limit=10)
+        text = "Give me 3 cups of hot tea please"
+        engine.parse(text)
+        mocked_get.reset_mock()
+
+        # When
+        result = engine.parse(text)
+
+        # Then
+        self.assertEqual(1, mocked_get.call_count)
+        self.assertEqual(1, engine.result_cache.hits)
+        self.assertEqual("snips/number", result[RES_SLOTS][0][RES_ENTITY])
+
+    @patch("snips_nlu.nlu_engine.nlu_engine.get_resolution_builtin_entities",
+           wraps=get_resolution_builtin_entities)
+    def test_should_reuse_builtin_slots_within_ttl(self, mocked_get):
+        # Given
+        dataset = BEVERAGE_DATASET
+        engine = SnipsNLUEngine().fit(dataset)
+        engine.result_cache = ParseResultCache(size_limit=10,
+                                               builtin_slots_ttl=3600)
+        text = "Give me 3 cups of hot tea please"
+        expected_result = engine.parse(text)
+        mocked_get.reset_mock()
+
+        # When
+        result = engine.parse(text)
+
+        # Then
+        mocked_get.assert_not_called()
+        self.assertDictEqual(expected_result, result)
+
+    def test_should_parse_batch(self):
+        # Given
+        dataset = BEVERAGE_DATASET
+        engine = SnipsNLUEngine().fit(dataset)
+        texts = [
+            "Give me 3 cups of hot tea please",
+            "Make me two cups of coffee",
+            "bla bla bla",
+            "make me one cup of iced tea",
+            ""
+        ]
+
+        # When
+        results = engine.parse_batch(texts)
+
+        # Then
+        expected_results = [engine.parse(text) for text in texts]
+        self.assertListEqual(expected_results, results)
+
+    def test_should_parse_concurrently(self):
+        # Given
+        dataset = BEVERAGE_DATASET
+        engine = SnipsNLUEngine().fit(dataset)
+        texts = [
+            "Give me 3 cups of hot tea please",
+            "Make me two cups of coffee",
+            "bla bla bla",
+            "make me one cup of iced tea and four cups of hot coffee"
+        ]
+        expected_results = [engine.parse(text) for text in texts]
+        results = [[] for _ in range(8)]
+
+        def parse_all(thread_idx):
+            for _ in range(10):
+                results[thread_idx].append(
+                    [engine.parse(text) for text in texts])
+
+        threads = [Thread(target=parse_all, args=(i,)) for i in range(8)]
+
+        # When
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Then
+        for thread_results in results:
+            self.assertEqual(10, len(thread_results))
+            for parsing_results in thread_results:
+                self.assertListEqual(expected_results, parsing_results)
+
+    @skipIf(sys.version_info < (3, 4), "asyncio requires python>=3.4")
+    def test_should_parse_async_in_batches(self):
+        # Given
+        import asyncio
+        dataset = BEVERAGE_DATASET
+        engine = SnipsNLUEngine().fit(dataset)
+        texts = [
+            "Give me 3 cups of hot tea please",
+            "Make me two cups of coffee",
+            "bla bla bla"
+        ]
+        expected_results = [engine.parse(text) for text in texts]
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        # When
+        with patch.object(engine, "parse_batch",
+                          wraps=engine.parse_batch) as mocked_parse_batch:
+            futures = [engine.parse_async(text) for text in texts]
+            results = loop.run_until_complete(asyncio.gather(*futures))
+        loop.close()
+        asyncio.set_event_loop(None)
+
+        # Then
+        mocked_parse_batch.assert_called_once_with(texts, None)
+        self.assertListEqual(expected_results, list(results))
+
+    @skipIf(sys.version_info < (3, 4), "asyncio requires python>=3.4")
+    def test_should_parse_async_in_successive_event_loops(self):
+        # Given
+        import asyncio
+        dataset = BEVERAGE_DATASET
+        engine = SnipsNLUEngine().fit(dataset)
+        text = "Make me two cups of coffee"
+        expected_result = engine.parse(text)
+
+        def parse_in_new_loop():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                return loop.run_until_complete(engine.parse_async(text))
+            finally:
+                loop.close()
+                asyncio.set_event_loop(None)
+
+        # When
+        first_result = parse_in_new_loop()
+        second_result = parse_in_new_loop()
+
+        # Then
+        self.assertEqual(expected_result, first_result)
+        self.assertEqual(expected_result, second_result)
+
+    @skipIf(sys.version_info < (3, 4), "asyncio requires python>=3.4")
+    def test_should_cancel_async_parsing_when_batch_is_cancelled(self):
+        # Given
+        import asyncio
+        from snips_nlu.nlu_engine.async_batcher import _resolve_futures
+
+        loop = asyncio.new_event_loop()
+        futures = [asyncio.Future(loop=loop) for _ in range(3)]
+        futures[0].set_result("result")
+        batch_future = asyncio.Future(loop=loop)
+        batch_future.cancel()
+
+        # When
+        _resolve_futures(futures, batch_future)
+        loop.close()
+
+        # Then
+        self.assertEqual("result", futures[0].result())
+        self.assertTrue(all(future.cancelled() for future in futures[1:]))
+
+    def test_should_parse_batch_with_intents_filter(self):
+        # Given
+        dataset = BEVERAGE_DATASET
+        engine = SnipsNLUEngine().fit(dataset)
+        texts = ["Make me two cups of tea", "Give me 3 cups of hot tea"]
+
+        # When
+        results = engine.parse_batch(texts, intents="MakeCoffee")
+
+        # Then
+        expected_results = [engine.parse(text, intents="MakeCoffee")
+                            for text in texts]
+        self.assertListEqual(expected_results, results)
+
     def test_should_be_serializable_into_bytearray(self):
         # Given
         dataset = BEVERAGE_DATASET
@@ -0,0 +1,72 @@
+from __future__ import unicode_literals
+
+from mock import patch
+
+from snips_nlu.parsing_context import ParsingContext, call_with_context
+from snips_nlu.tests.utils import SnipsTest
+
+
+class TestParsingContext(SnipsTest):
+    def test_should_compute_tokens_once(self):
+        # Given
+        context = ParsingContext("Hello World", "en")
+
+        # When
+        tokens_values = context.tokens_values
+        tokens = context.tokens
+
+        # Then
+        self.assertListEqual(["Hello", "World"], tokens_values)
+        self.assertIs(tokens, context.tokens)
+
+    @patch("snips_nlu.parsing_context.get_builtin_entities")
+    def test_should_memoize_builtin_entities(self, mocked_get_builtin_entities):
+        # Given
+        mocked_get_builtin_entities.return_value = []
+        context = ParsingContext("meet me at 2pm", "en")
+
+        # When
+        context.get_builtin_entities()
+        context.get_builtin_entities()
+        context.get_builtin_entities(["snips/datetime", "snips/number"])
+        context.get_builtin_entities(["snips/number", "snips/datetime"])
+
+        # Then
+        self.assertEqual(2, mocked_get_builtin_entities.call_count)
+
+    def test_should_call_with_context_when_accepted(self):
+        # Given
+        context = ParsingContext("hello", "en")
+
+        def parse(text, intents, context=None):
+            return text, intents, context
+
+        # When
+        result = call_with_context(parse, "hello", None, context=context)
+
+        # Then
+        self.assertEqual(("hello", None, context), result)
+
+    def test_should_call_without_context_when_not_accepted(self):
+        # Given
+        context = ParsingContext("hello", "en")
+
+        def parse(text, intents):
+            return text, intents
+
+        # When
+        result = call_with_context(parse, "hello", None, context=context)
+
+        # Then
+        self.assertEqual(("hello", None), result)
+
+    def test_should_not_hide_other_type_errors(self):
+        # Given
+        context = ParsingContext("hello", "en")
+
+        def parse(text, intents, context=None):
+            raise TypeError("unsupported operand type(s)")
+
+        # When / Then
+        with self.assertRaises(TypeError):
+            call_with_context(parse, "hello", None, context=context)
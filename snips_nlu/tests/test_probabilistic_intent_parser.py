@@ -76,6 +76,43 @@ class TestProbabilisticIntentParser(FixtureTest):
             parser.fit(BEVERAGE_DATASET, force_retrain=False)
             self.assertEqual(1, mock_fit.call_count)
 
+    def test_should_fit_slot_fillers_in_parallel(self):
+        # Given
+        dataset = validate_and_format_dataset(BEVERAGE_DATASET)
+        slot_filler_config = CRFSlotFillerConfig(random_seed=42)
+        sequential_parser = ProbabilisticIntentParser(
+            ProbabilisticIntentParserConfig(
+                slot_filler_config=slot_filler_config))
+        parallel_parser = ProbabilisticIntentParser(
+            ProbabilisticIntentParserConfig(
+                slot_filler_config=slot_filler_config, n_jobs=2))
+        texts = ["Make me two cups of tea", "I want 3 hot coffees",
+                 "make me a cup of iced tea"]
+
+        # When
+        sequential_parser.fit(dataset)
+        parallel_parser.fit(dataset)
+
+        # Then
+        self.assertTrue(parallel_parser.fitted)
+        for text in texts:
+            self.assertDictEqual(sequential_parser.parse(text),
+                                 parallel_parser.parse(text))
+
+    def test_should_parse_batch(self):
+        # Given
+        dataset = validate_and_format_dataset(BEVERAGE_DATASET)
+        parser = ProbabilisticIntentParser().fit(dataset)
+        texts = ["Make me two cups of tea", "I want 3 hot coffees",
+                 "bla bla bla", "make me a cup of iced tea"]
+
+        # When
+        results = parser.parse_batch(texts)
+
+        # Then
+        expected_results = [parser.parse(text) for text in texts]
+        self.assertListEqual(expected_results, results)
+
     def test_should_not_parse_when_not_fitted(self):
         # Given
         parser = ProbabilisticIntentParser()
@@ -0,0 +1,41 @@
+from __future__ import unicode_literals
+
+from snips_nlu.nlu_engine.result_cache import CachedParsing, ParseResultCache
+from snips_nlu.tests.utils import SnipsTest
+
+
+class TestParseResultCache(SnipsTest):
+    def test_should_evict_least_recently_used_parsing(self):
+        # Given
+        cache = ParseResultCache(size_limit=2)
+        parsing = CachedParsing(None, [], [], 0.)
+        cache.put("a", None, parsing)
+        cache.put("b", None, parsing)
+        cache.get("a")
+
+        # When
+        cache.put("c", None, parsing)
+
+        # Then
+        self.assertEqual(2, len(cache))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_should_key_on_intents_filter(self):
+        # Given
+        cache = ParseResultCache(size_limit=10)
+        parsing = CachedParsing(None, [], [], 0.)
+        cache.put("a", ["intent1", "intent2"], parsing)
+
+        # When
+        result_with_other_intents = cache.get("a", ["intent1"])
+        result_without_intents = cache.get("a")
+        result_with_same_intents = cache.get("a", ["intent2", "intent1"])
+
+        # Then
+        self.assertIsNone(result_with_other_intents)
+        self.assertIsNone(result_without_intents)
+        self.assertEqual(parsing, result_with_same_intents)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(2, cache.misses)
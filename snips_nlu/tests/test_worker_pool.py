@@ -0,0 +1,48 @@
+from __future__ import unicode_literals
+
+from snips_nlu.nlu_engine import EngineWorkerPool, SnipsNLUEngine
+from snips_nlu.tests.utils import BEVERAGE_DATASET, FixtureTest
+
+
+class TestEngineWorkerPool(FixtureTest):
+    def setUp(self):
+        super(TestEngineWorkerPool, self).setUp()
+        self.engine = SnipsNLUEngine().fit(BEVERAGE_DATASET)
+        self.engine.persist(self.tmp_file_path)
+
+    def test_should_parse(self):
+        # Given
+        text = "Make me two cups of coffee"
+
+        # When
+        with EngineWorkerPool(self.tmp_file_path, n_workers=2) as pool:
+            result = pool.parse(text)
+
+        # Then
+        self.assertDictEqual(self.engine.parse(text), result)
+
+    def test_should_parse_batch(self):
+        # Given
+        texts = [
+            "Give me 3 cups of hot tea please",
+            "Make me two cups of coffee",
+            "bla bla bla"
+        ]
+
+        # When
+        with EngineWorkerPool(self.tmp_file_path, n_workers=2) as pool:
+            results = pool.parse_batch(texts, intents="MakeTea")
+
+        # Then
+        expected_results = [self.engine.parse(text, intents="MakeTea")
+                            for text in texts]
+        self.assertListEqual(expected_results, results)
+
+    def test_should_not_parse_when_closed(self):
+        # Given
+        pool = EngineWorkerPool(self.tmp_file_path, n_workers=1)
+        pool.close()
+
+        # When / Then
+        with self.assertRaises(ValueError):
+            pool.parse("Make me two cups of coffee")